@@ -3,7 +3,7 @@ from typing import Dict, Any, List
 from core.agent_base import BaseAgent, AgentInput, AgentOutput
 from database.qdrant_db import qdrant_manager
 from utils.embeddings import get_embedding
-from llm.groq_client import groq_llm
+from llm.groq_client import get_groq_llm
 import logging
 import json
 
@@ -210,6 +210,7 @@ class CaseSimilarityAgent(BaseAgent):
         Returns:
             List of structured case analysis dictionaries
         """
+        groq_llm = get_groq_llm()
         if groq_llm is None:
             self.logger.warning("Groq LLM not available for case analysis")
             return []
@@ -284,7 +285,8 @@ Analyze each case and provide structured information. Return ONLY a JSON array."
             # Clean and parse JSON
             result = result.strip()
             if result.startswith("```"):
-                result = result.split("```")[1]
+                end = result.find("```", 3)
+                result = result[3:] if end == -1 else result[3:end]
                 if result.startswith("json"):
                     result = result[4:]
                 result = result.strip()
@@ -317,5 +319,6 @@ Analyze each case and provide structured information. Return ONLY a JSON array."
             return []
             
         except Exception as e:
-            self.logger.error(f"Error in LLM case analysis: {e}", exc_info=True)
+            self.logger.error(f"Error in LLM case analysis: {e}")
+            self.logger.debug("Error in LLM case analysis (traceback)", exc_info=True)
             return []
\ No newline at end of file
@@ -3,7 +3,7 @@ from typing import Dict, Any, List
 from core.agent_base import BaseAgent, AgentInput, AgentOutput
 from database.qdrant_db import qdrant_manager
 from utils.embeddings import get_embedding
-from llm.groq_client import groq_llm
+from llm.groq_client import get_groq_llm
 import json
 import logging
 
@@ -152,6 +152,7 @@ class ClassificationAgent(BaseAgent):
         Returns:
             List of classified domain names
         """
+        groq_llm = get_groq_llm()
         if groq_llm is None:
             self.logger.warning("Groq LLM not available for classification")
             return []
@@ -196,7 +197,8 @@ Return a JSON array of domain names (1-3 domains). Only use domains from the ava
             
             # Remove markdown code blocks if present
             if result.startswith("```"):
-                result = result.split("```")[1]
+                end = result.find("```", 3)
+                result = result[3:] if end == -1 else result[3:end]
                 if result.startswith("json"):
                     result = result[4:]
                 result = result.strip()
@@ -212,10 +214,8 @@ Return a JSON array of domain names (1-3 domains). Only use domains from the ava
                         return valid_domains[:3]
             except json.JSONDecodeError:
                 # Try to extract domains from text response
-                domains = []
-                for domain in LEGAL_DOMAINS:
-                    if domain.lower() in result.lower():
-                        domains.append(domain)
+                result_lower = result.lower()
+                domains = [domain for domain in LEGAL_DOMAINS if domain.lower() in result_lower]
                 if domains:
                     self.logger.info(f"✓ LLM classified (extracted): {domains}")
                     return domains[:3]
@@ -223,5 +223,6 @@ Return a JSON array of domain names (1-3 domains). Only use domains from the ava
             return []
             
         except Exception as e:
-            self.logger.error(f"Error in LLM classification: {e}", exc_info=True)
+            self.logger.error(f"Error in LLM classification: {e}")
+            self.logger.debug("Error in LLM classification (traceback)", exc_info=True)
             return []
\ No newline at end of file
@@ -1,7 +1,7 @@
 """Ethics & Safety Agent - Monitors outputs for safety and ethics."""
 from typing import Dict, Any, List
 from core.agent_base import BaseAgent, AgentInput, AgentOutput
-from llm.groq_client import groq_llm
+from llm.groq_client import get_groq_llm
 import json
 import logging
 
@@ -119,6 +119,7 @@ class EthicsAgent(BaseAgent):
         Returns:
             Dictionary with safety check results
         """
+        groq_llm = get_groq_llm()
         if groq_llm is None:
             self.logger.warning("Groq LLM not available for safety checking")
             return {"is_safe": True, "issues": [], "method": "keyword"}
@@ -179,7 +180,8 @@ Analyze and return JSON with safety assessment."""
             # Clean and parse JSON
             result = result.strip()
             if result.startswith("```"):
-                result = result.split("```")[1]
+                end = result.find("```", 3)
+                result = result[3:] if end == -1 else result[3:end]
                 if result.startswith("json"):
                     result = result[4:]
                 result = result.strip()
@@ -196,5 +198,6 @@ Analyze and return JSON with safety assessment."""
             return {"is_safe": True, "issues": [], "method": "keyword"}
             
         except Exception as e:
-            self.logger.error(f"Error in LLM safety check: {e}", exc_info=True)
+            self.logger.error(f"Error in LLM safety check: {e}")
+            self.logger.debug("Error in LLM safety check (traceback)", exc_info=True)
             return {"is_safe": True, "issues": [], "method": "keyword"}
\ No newline at end of file
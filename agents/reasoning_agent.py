@@ -1,7 +1,7 @@
 """Legal Reasoning Agent - Provides retrieval-bounded legal reasoning."""
 from typing import Dict, Any, List
 from core.agent_base import BaseAgent, AgentInput, AgentOutput
-from llm.groq_client import groq_llm
+from llm.groq_client import get_groq_llm
 from utils.tavily_search import get_tavily_search
 
 
@@ -112,6 +112,7 @@ IMPORTANT:
         # Generate reasoning
         explanation = None
         try:
+            groq_llm = get_groq_llm()
             if groq_llm is None:
                 self.logger.error("Groq LLM not initialized")
                 explanation = None
@@ -126,7 +127,8 @@ IMPORTANT:
                 if not explanation:
                     self.logger.warning("Groq returned empty/None response")
         except Exception as e:
-            self.logger.error(f"Error generating reasoning with Groq: {e}", exc_info=True)
+            self.logger.error(f"Error generating reasoning with Groq: {e}")
+            self.logger.debug("Error generating reasoning with Groq (traceback)", exc_info=True)
             explanation = None
         
         # Fallback if Groq failed
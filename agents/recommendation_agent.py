@@ -3,7 +3,7 @@ from typing import Dict, Any, List, Set
 from core.agent_base import BaseAgent, AgentInput, AgentOutput
 from database.qdrant_db import qdrant_manager
 from utils.embeddings import get_embedding
-from llm.groq_client import groq_llm
+from llm.groq_client import get_groq_llm
 import logging
 import json
 
@@ -195,6 +195,7 @@ class RecommendationAgent(BaseAgent):
         Returns:
             List of structured recommendation dictionaries
         """
+        groq_llm = get_groq_llm()
         if groq_llm is None:
             self.logger.warning("Groq LLM not available for recommendation generation")
             return []
@@ -273,7 +274,8 @@ Return ONLY a JSON array."""
             # Clean and parse JSON
             result = result.strip()
             if result.startswith("```"):
-                result = result.split("```")[1]
+                end = result.find("```", 3)
+                result = result[3:] if end == -1 else result[3:end]
                 if result.startswith("json"):
                     result = result[4:]
                 result = result.strip()
@@ -303,5 +305,6 @@ Return ONLY a JSON array."""
             return []
             
         except Exception as e:
-            self.logger.error(f"Error in LLM recommendation generation: {e}", exc_info=True)
+            self.logger.error(f"Error in LLM recommendation generation: {e}")
+            self.logger.debug("Error in LLM recommendation generation (traceback)", exc_info=True)
             return []
\ No newline at end of file
@@ -1,7 +1,7 @@
 """Router Agent - Intelligently routes queries to appropriate agent pipeline."""
 from typing import Dict, Any, List, Literal
 from core.agent_base import BaseAgent, AgentInput, AgentOutput
-from llm.groq_client import groq_llm
+from llm.groq_client import get_groq_llm
 import logging
 import json
 
@@ -91,6 +91,7 @@ class RouterAgent(BaseAgent):
     
     def _llm_classify(self, query: str) -> Dict[str, Any]:
         """Use LLM to classify query type."""
+        groq_llm = get_groq_llm()
         if groq_llm is None:
             return {"success": False}
         
@@ -121,7 +122,8 @@ Return ONLY a JSON object:
             # Parse JSON
             result = result.strip()
             if result.startswith("```"):
-                result = result.split("```")[1]
+                end = result.find("```", 3)
+                result = result[3:] if end == -1 else result[3:end]
                 if result.startswith("json"):
                     result = result[4:]
                 result = result.strip()
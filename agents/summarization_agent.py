@@ -1,7 +1,7 @@
 """Summarization Agent - Collects all agent outputs and generates unified final response."""
 from typing import Dict, Any, List
 from core.agent_base import BaseAgent, AgentInput, AgentOutput
-from llm.groq_client import groq_llm
+from llm.groq_client import get_groq_llm
 from utils.tavily_search import get_tavily_search
 import logging
 
@@ -179,6 +179,7 @@ class SummarizationAgent(BaseAgent):
         Returns:
             Generated unified response from LLM
         """
+        groq_llm = get_groq_llm()
         if groq_llm is None:
             self.logger.warning("Groq LLM not available for summarization")
             return None
@@ -222,15 +223,17 @@ QUALITY STANDARDS:
                 max_tokens=2000
             )
             
-            if result and result.strip():
+            # generate_response() already returns stripped text
+            if result:
                 self.logger.info("✓ LLM summarization successful")
-                return result.strip()
+                return result
             else:
                 self.logger.warning("LLM returned empty response")
                 return None
                 
         except Exception as e:
-            self.logger.error(f"Error calling LLM for summarization: {e}", exc_info=True)
+            self.logger.error(f"Error calling LLM for summarization: {e}")
+            self.logger.debug("Error calling LLM for summarization (traceback)", exc_info=True)
             return None
     
     def _format_final_response(self, collected_outputs: Dict[str, Any], unified_summary: str) -> Dict[str, Any]:
@@ -401,7 +404,7 @@ QUALITY STANDARDS:
                 reasoning="Successfully synthesized unified response from all agent outputs",
                 agent_name=self.name,
                 metadata={
-                    "llm_used": unified_summary is not None and groq_llm is not None,
+                    "llm_used": unified_summary is not None and get_groq_llm() is not None,
                     "agents_synthesized": len(agent_outputs),
                     "statutes_count": len(collected_outputs.get("statutes", [])),
                     "cases_count": len(collected_outputs.get("similar_cases", []))
@@ -409,7 +412,8 @@ QUALITY STANDARDS:
             )
             
         except Exception as e:
-            self.logger.error(f"Error in summarization agent: {e}", exc_info=True)
+            self.logger.error(f"Error in summarization agent: {e}")
+            self.logger.debug("Error in summarization agent (traceback)", exc_info=True)
             return AgentOutput(
                 result={
                     "unified_summary": f"Error generating unified response: {str(e)}",
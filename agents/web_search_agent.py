@@ -3,6 +3,13 @@ from typing import Dict, Any, List
 from core.agent_base import BaseAgent, AgentInput, AgentOutput
 from utils.tavily_search import get_tavily_search
 
+# Reliable government / legal / educational sources for web search
+_LEGAL_DOMAINS = (
+    "gov.in", "indiankanoon.org", "supremecourtofindia.nic.in",
+    "legislative.gov.in", "lawcommissionofindia.nic.in",
+    "worldlii.org", "edu"
+)
+
 
 class WebSearchAgent(BaseAgent):
     """Searches the public web for reliable legal information."""
@@ -45,11 +52,7 @@ class WebSearchAgent(BaseAgent):
             web_results = tavily.search(
                 query=search_query,
                 max_results=5,
-                include_domains=[
-                    "gov.in", "indiankanoon.org", "supremecourtofindia.nic.in",
-                    "legislative.gov.in", "lawcommissionofindia.nic.in",
-                    "worldlii.org", "edu"
-                ]
+                include_domains=list(_LEGAL_DOMAINS)
             )
             
             # Format results
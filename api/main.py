@@ -1,7 +1,14 @@
 """FastAPI main application."""
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse
+import importlib
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+import orjson
 from config.settings import settings
 # Orchestrator is initialized lazily via _init_orchestrator() in endpoints
 from database.qdrant_db import qdrant_manager
@@ -13,10 +20,46 @@ from api.schemas import (
 logging.basicConfig(level=getattr(logging, settings.log_level))
 logger = logging.getLogger(__name__)
 
+# Modules the first query would otherwise import (Groq SDK, Tavily, pipeline)
+_PRELOAD_MODULES = ("llm.groq_client", "utils.tavily_search", "core.simple_pipeline")
+
+
+def _warm_up_embedding_model():
+    """Import and load the embedding model so the first query doesn't pay for it."""
+    try:
+        from utils.embeddings import get_embedding_model
+        get_embedding_model()
+    except Exception as e:
+        logger.warning(f"Embedding model warmup failed: {e}")
+
+
+def _preload_module(name: str):
+    """Import `name` ahead of the first request; failures are retried on use."""
+    try:
+        importlib.import_module(name)
+    except Exception as e:
+        logger.warning(f"Preloading {name} failed: {e}")
+
+
+def _warm_up():
+    """Load the embedding model and preload request-path modules concurrently."""
+    with ThreadPoolExecutor(max_workers=len(_PRELOAD_MODULES) + 1) as executor:
+        executor.submit(_warm_up_embedding_model)
+        executor.map(_preload_module, _PRELOAD_MODULES)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up heavy dependencies in the background while the server starts."""
+    threading.Thread(target=_warm_up, name="startup-warmup", daemon=True).start()
+    yield
+
+
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
-    description="Multi-Agent Legal Rights & Civic Access System"
+    description="Multi-Agent Legal Rights & Civic Access System",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -28,6 +71,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON responses (statute/case texts compress well)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 
 @app.get("/", tags=["Root"])
 async def root():
@@ -82,7 +128,7 @@ async def process_query_simple(request: QueryRequest):
     
     except Exception as e:
         logger.error(f"Error in simple query: {e}", exc_info=True)
-        from datetime import datetime
+        from datetime import datetime, timezone
         import uuid
         return {
             "case_id": str(uuid.uuid4()),
@@ -90,10 +136,32 @@ async def process_query_simple(request: QueryRequest):
             "response": f"I apologize, but an error occurred: {e}\n\nPlease try again.",
             "sources": {"database_docs": 0, "web_results": 0, "retrieval_status": "error"},
             "error": str(e),
-            "generated_at": datetime.now().isoformat()
+            "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds")
         }
 
 
+@app.post("/api/v1/query/stream", tags=["Query"])
+async def process_query_stream(request: QueryRequest):
+    """STREAM: Same pipeline as /query/simple, streamed as Server-Sent Events.
+    
+    Emits `event: token` messages as the LLM produces text, followed by a
+    single `event: result` message carrying the full /query/simple payload.
+    Each `data:` field is JSON-encoded.
+    """
+    logger.info(f"Processing streamed query: {request.query[:100]}...")
+    
+    from core.simple_pipeline import query_stream
+    
+    def _sse_events():
+        for event in query_stream(
+            user_query=request.query,
+            user_id=request.user_id or "anonymous"
+        ):
+            yield b"event: " + event["event"].encode() + b"\ndata: " + orjson.dumps(event["data"]) + b"\n\n"
+    
+    return StreamingResponse(_sse_events(), media_type="text/event-stream")
+
+
 @app.post("/api/v1/query/smart", tags=["Query"])
 async def process_query_smart(request: QueryRequest):
     """SMART: Process query with intelligent agent routing.
@@ -123,7 +191,7 @@ async def process_query_smart(request: QueryRequest):
     
     except Exception as e:
         logger.error(f"Error processing smart query: {e}", exc_info=True)
-        from datetime import datetime
+        from datetime import datetime, timezone
         import uuid
         return {
             "case_id": str(uuid.uuid4()),
@@ -133,7 +201,7 @@ async def process_query_smart(request: QueryRequest):
             "retrieved_evidence": {"statutes": [], "cases": [], "total_count": 0},
             "recommendations": [],
             "agent_trace": {"error": str(e)},
-            "generated_at": datetime.now().isoformat()
+            "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds")
         }
 
 
@@ -168,7 +236,7 @@ async def process_query_structured(request: QueryRequest):
     except Exception as e:
         logger.error(f"Error processing structured query: {e}", exc_info=True)
         # Return error response
-        from datetime import datetime
+        from datetime import datetime, timezone
         import uuid
         return StructuredQueryResponse(
             case_id=str(uuid.uuid4()),
@@ -190,7 +258,7 @@ async def process_query_structured(request: QueryRequest):
                 "case_analysis_summary": "Failed",
                 "recommendation_count": 0
             },
-            generated_at=datetime.now().isoformat()
+            generated_at=datetime.now(timezone.utc).isoformat(timespec="seconds")
         )
 
 
@@ -316,7 +384,3 @@ async def search_memory(request: MemoryRequest):
     except Exception as e:
         logger.error(f"Error searching memory: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-
-if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -19,12 +19,20 @@ class Settings(BaseSettings):
     
     # Groq Configuration
     groq_api_key: Optional[str] = os.environ.get("GROQ_API_KEY")
+    groq_startup_check: bool = False  # 1-token request when the client is created
     
     # Tavily Search Configuration
     tavily_api_key: Optional[str] = os.environ.get("TAVILY_API_KEY")
 
     # Embedding Model
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    embedding_int8: bool = False  # int8-quantize the encoder on CPU (FP16 is automatic on CUDA)
+    embedding_cache_path: str = ".emb_cache.sqlite3"
+    ingest_state_path: str = ".ingest_state.sqlite3"
+    
+    # Connector downloads: per-host token bucket (requests/second, burst size)
+    connector_rate_per_second: float = 5.0
+    connector_burst: int = 10
     
     # Application
     app_name: str = "NyayaAI"
@@ -5,35 +5,105 @@ text resources (HTML, text, PDF links) into the `statutes_vectors` collection
 or a collection you provide.
 """
 import logging
+import queue
+import threading
 import time
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
 
-import requests
+import orjson
 from qdrant_client.models import PointStruct
 
-from utils.embeddings import get_embeddings
-from database.qdrant_db import qdrant_manager
-from connectors.helpers import generic_ingest_url
+from utils.embeddings_cache import cached_get_embeddings
+from utils.payload_codec import encode_chunk_text
+from database.qdrant_db import next_point_id, qdrant_manager
+from connectors.helpers import (
+    content_version,
+    fetch,
+    generic_ingest_url,
+    is_unchanged,
+    source_version,
+    stream_text_chunks,
+)
+from utils.ingest_state import mark_ingested
 
 logger = logging.getLogger(__name__)
 
 
+# Bounded hand-off between download workers and the embed/upload consumer;
+# producers block when it is full, capping memory at ~QUEUE_MAXSIZE chunks.
+QUEUE_MAXSIZE = 64
+EMBED_BATCH_SIZE = 64
+
+_DONE = object()
+
+
+def _produce_chunks(resource: dict, out: queue.Queue, stop: threading.Event) -> None:
+    """Stream one dataset resource and enqueue (chunk, chunk_index, provenance) items."""
+    url = resource.get("url")
+    if not url:
+        return
+    prov = {"source_url": url, "resource_name": resource.get("name")}
+    try:
+        for idx, chunk in enumerate(stream_text_chunks(url)):
+            if stop.is_set():
+                return
+            out.put((chunk, idx, prov))
+    except Exception:
+        logger.debug(f"Skipping non-text resource: {url}")
+
+
+def _upload_batch(collection_name: str, batch: List[Tuple[str, int, dict]]) -> Optional[int]:
+    """Embed a batch of queued chunks and upload them as points.
+
+    Returns the first point's ID on success, else None.
+    """
+    embeddings = cached_get_embeddings([chunk for chunk, _, _ in batch])
+    points = []
+    for (chunk, idx, prov), emb in zip(batch, embeddings):
+        pid = next_point_id()
+        payload = {
+            "source_name": "data.gov.in",
+            "source_url": prov.get("source_url"),
+            "resource_name": prov.get("resource_name"),
+            "ingestion_date": int(time.time()),
+            "chunk_index": idx,
+            **encode_chunk_text(chunk),
+            "jurisdiction": "india",
+        }
+        points.append(PointStruct(id=pid, vector=emb, payload=payload))
+    if not qdrant_manager.upload_points(collection_name, points):
+        return None
+    return points[0].id
+
+
 def ingest_from_datagov_dataset(api_dataset_url: str, collection_name: str = "statutes_vectors") -> bool:
     """Fetch CKAN-style dataset JSON and ingest its textual resources.
 
     Example dataset URL: https://data.gov.in/sites/default/files/dataset.json
     """
     logger.info(f"Fetching dataset metadata: {api_dataset_url}")
+    version = source_version(api_dataset_url)
+    if is_unchanged(api_dataset_url, collection_name, version):
+        return True
+
     try:
-        resp = requests.get(api_dataset_url, timeout=30)
+        resp = fetch(api_dataset_url)
         resp.raise_for_status()
         try:
-            data = resp.json()
-        except Exception:
+            data = orjson.loads(resp.content)
+        except orjson.JSONDecodeError:
             data = None
     except Exception as e:
         logger.error(f"Failed to fetch dataset JSON: {e}")
         return False
+
+    # The dataset metadata lists every resource, so its version stands in
+    # for the whole dataset.
+    if version is None:
+        version = content_version(resp.content)
+        if is_unchanged(api_dataset_url, collection_name, version):
+            return True
     resources = []
     if data:
         resources = data.get("resources") or []
@@ -49,47 +119,59 @@ def ingest_from_datagov_dataset(api_dataset_url: str, collection_name: str = "st
                     resources.append({"url": href, "name": a.get_text(strip=True) or href})
         except Exception:
             resources = []
-    text_items: List[str] = []
-    provenance: List[dict] = []
+    # Downloads are I/O bound; stream resources concurrently (each request
+    # still waits for the per-host rate limit) while this thread embeds and
+    # uploads chunks as they arrive.
+    chunks: queue.Queue = queue.Queue(maxsize=QUEUE_MAXSIZE)
+    stop = threading.Event()
 
-    for r in resources:
-        url = r.get("url")
-        if not url:
-            continue
+    def produce_all() -> None:
         try:
-            content = requests.get(url, timeout=30).text
-        except Exception:
-            logger.debug(f"Skipping non-text resource: {url}")
-            continue
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                list(executor.map(lambda r: _produce_chunks(r, chunks, stop), resources))
+        finally:
+            chunks.put(_DONE)
 
-        # Add as one item per resource (caller can re-chunk)
-        text_items.append(content)
-        provenance.append({"source_url": url, "resource_name": r.get("name")})
+    producer = threading.Thread(target=produce_all, daemon=True)
+    producer.start()
 
-    if not text_items:
+    uploaded = 0
+    failed = False
+    sample_id = None
+    batch: List[Tuple[str, int, dict]] = []
+    try:
+        while True:
+            item = chunks.get()
+            if item is not _DONE:
+                batch.append(item)
+            if batch and (item is _DONE or len(batch) >= EMBED_BATCH_SIZE):
+                if uploaded == 0:
+                    # Ensure the target collection exists once, not per batch
+                    qdrant_manager.create_collection(collection_name)
+                batch_sample_id = _upload_batch(collection_name, batch)
+                if batch_sample_id is None:
+                    failed = True
+                elif sample_id is None:
+                    sample_id = batch_sample_id
+                uploaded += len(batch)
+                batch = []
+            if item is _DONE:
+                break
+    finally:
+        stop.set()
+        # Unblock producers still waiting on a full queue
+        while producer.is_alive():
+            try:
+                chunks.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+    if not uploaded:
         logger.info("No textual resources found in dataset")
         return False
-
-    # Chunking approach: simple split by paragraphs and ingest in batches
-    batch_size = 64
-    for i in range(0, len(text_items), batch_size):
-        batch = text_items[i : i + batch_size]
-        embeddings = get_embeddings(batch)
-        points = []
-        for j, (text, prov) in enumerate(zip(batch, provenance[i : i + batch_size])):
-            pid = f"datagov-{int(time.time())}-{i+j}"
-            payload = {
-                "source_name": "data.gov.in",
-                "source_url": prov.get("source_url"),
-                "resource_name": prov.get("resource_name"),
-                "ingestion_date": int(time.time()),
-                "chunk_text": text[:2000],
-                "jurisdiction": "india",
-            }
-            points.append(PointStruct(id=pid, vector=embeddings[j], payload=payload))
-
-        qdrant_manager.create_collection(collection_name)
-        qdrant_manager.upsert_points(collection_name, points)
+    if failed:
+        return False
+    mark_ingested(api_dataset_url, collection_name, version, sample_id)
 
     logger.info("Completed ingest from data.gov dataset")
     return True
@@ -1,35 +1,191 @@
 """Shared helper utilities for connectors: download, extraction, OCR fallback, generic ingestion."""
+import hashlib
 import logging
+import threading
 import time
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Sequence
+from urllib.parse import urlparse
 
-import requests
+import httpx
 from qdrant_client.models import PointStruct
 
-from database.qdrant_db import qdrant_manager
-from utils.embeddings import get_embeddings
+from config.settings import settings
+from database.qdrant_db import next_point_id, qdrant_manager
+from utils.embeddings_cache import cached_get_embeddings
+from utils.ingest_state import ingested_sample_id, mark_ingested
+from utils.payload_codec import encode_chunk_text
+
+try:
+    # Optional C-backed HTML parser; BeautifulSoup is used when it is missing.
+    from selectolax.parser import HTMLParser
+except ImportError:  # pragma: no cover
+    HTMLParser = None
 
 logger = logging.getLogger(__name__)
 
+# Per-host request budget: sustained requests/second and burst size.
+HOST_RATE_PER_SECOND = settings.connector_rate_per_second
+HOST_BURST = settings.connector_burst
+
+# Retry policy for fetch(): attempts after the first, base backoff, retryable statuses.
+FETCH_RETRIES = 3
+FETCH_BACKOFF_SECONDS = 0.3
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` acquisitions/second, bursting to `burst`."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_host_limiters: Dict[str, TokenBucket] = {}
+_host_limiters_lock = threading.Lock()
+
+
+def throttle(url: str) -> None:
+    """Wait for the per-host rate limit of `url`'s host.
+
+    Each host has its own bucket, so requests to unrelated hosts never
+    throttle each other.
+    """
+    host = urlparse(url).netloc
+    with _host_limiters_lock:
+        limiter = _host_limiters.get(host)
+        if limiter is None:
+            limiter = _host_limiters[host] = TokenBucket(HOST_RATE_PER_SECOND, HOST_BURST)
+    limiter.acquire()
+
+
+_http_client: Optional[httpx.Client] = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """Get the shared HTTP/2 client used for all connector downloads.
+
+    One client means one keep-alive (and, for HTTP/2 hosts, multiplexed)
+    connection per host shared by every connector and worker thread.
+    """
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = httpx.Client(
+                http2=True,
+                timeout=httpx.Timeout(30.0, connect=5.0),
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+                follow_redirects=True,
+            )
+    return _http_client
+
+
+def close_http_client() -> None:
+    """Close the shared HTTP client; the next fetch() opens a new one."""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
+
+
+def fetch(url: str, **kwargs) -> httpx.Response:
+    """GET `url` after waiting for its host's rate limit. All connector downloads go through here.
+
+    Transport errors and retryable statuses (429/5xx) are retried up to
+    FETCH_RETRIES times with exponential backoff; the last response or
+    error is returned/raised as-is.
+    """
+    for attempt in range(FETCH_RETRIES + 1):
+        throttle(url)
+        try:
+            resp = get_http_client().get(url, **kwargs)
+        except httpx.TransportError as e:
+            if attempt == FETCH_RETRIES:
+                raise
+            logger.debug(f"Fetch attempt {attempt + 1} for {url} failed: {e}")
+        else:
+            if resp.status_code not in RETRY_STATUSES or attempt == FETCH_RETRIES:
+                return resp
+            logger.debug(f"Fetch attempt {attempt + 1} for {url} returned {resp.status_code}")
+        time.sleep(FETCH_BACKOFF_SECONDS * (2 ** attempt))
+
+
+def source_version(url: str) -> Optional[str]:
+    """ETag (or Last-Modified) of `url` from a HEAD request; None if the server sends neither
+    or the URL cannot be requested at all (callers then fall back to content_version())."""
+    try:
+        throttle(url)
+        resp = get_http_client().head(url)
+    except (httpx.HTTPError, httpx.InvalidURL, ValueError) as e:
+        logger.debug(f"HEAD {url} failed: {e}")
+        return None
+    if resp.is_error:
+        return None
+    return resp.headers.get("ETag") or resp.headers.get("Last-Modified")
+
+
+def content_version(content: bytes) -> str:
+    """Version string for a downloaded body when the server gave no validator."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def is_unchanged(url: str, collection_name: str, version: Optional[str]) -> bool:
+    """True if `url` was already ingested into the collection at `version`
+    and its points are still there (the collection may have been recreated)."""
+    if not version:
+        return False
+    sample_id = ingested_sample_id(url, collection_name, version)
+    if sample_id is None:
+        return False
+    if not qdrant_manager.get_existing_ids(collection_name, [sample_id]):
+        logger.info(f"Re-ingesting {url}: its points are no longer in {collection_name}")
+        return False
+    logger.info(f"Skipping unchanged source: {url}")
+    return True
+
 
 def download_bytes(url: str) -> bytes:
-    resp = requests.get(url, timeout=30)
+    resp = fetch(url)
     resp.raise_for_status()
     return resp.content
 
 
-def extract_text_from_html_bytes(html_bytes: bytes) -> str:
-    try:
-        from bs4 import BeautifulSoup
-    except Exception:
-        raise
+def extract_text_from_html_bytes(
+    html_bytes: bytes,
+    tags: Sequence[str] = ("p", "div", "pre", "section"),
+) -> str:
+    """Extract text from the given tags (or the whole page if none match), skipping scripts/styles."""
+    if HTMLParser is not None:
+        tree = HTMLParser(html_bytes)
+        tree.strip_tags(["script", "style"])
+        parts = tree.css(",".join(tags)) or [tree.body or tree.root]
+        return "\n".join(p.text(separator=" ").strip() for p in parts if p is not None)
+
+    from bs4 import BeautifulSoup
 
     soup = BeautifulSoup(html_bytes, "html.parser")
     for s in soup(["script", "style"]):
         s.decompose()
-    parts = soup.find_all(["p", "div", "pre", "section"]) or [soup]
-    text = "\n".join([p.get_text(separator=" ").strip() for p in parts])
-    return text
+    parts = soup.find_all(list(tags)) or [soup]
+    return "\n".join(p.get_text(separator=" ").strip() for p in parts)
 
 
 def extract_text_from_pdf_bytes(pdf_bytes: bytes) -> str:
@@ -83,18 +239,31 @@ def extract_text_from_pdf_bytes(pdf_bytes: bytes) -> str:
 
 
 def chunk_text(text: str, chunk_size: int = 800, overlap: int = 150) -> List[str]:
-    chunks = []
-    start = 0
-    length = len(text)
-    while start < length:
-        end = min(start + chunk_size, length)
-        chunk = text[start:end].strip()
-        if chunk:
-            chunks.append(chunk)
-        if end == length:
-            break
-        start = max(0, end - overlap)
-    return chunks
+    """Split text into overlapping fixed-size chunks, dropping whitespace-only ones."""
+    stride = chunk_size - overlap
+    starts = range(0, max(1, len(text) - overlap), stride)
+    return [chunk for chunk in (text[s:s + chunk_size].strip() for s in starts) if chunk]
+
+
+def stream_text_chunks(url: str, chunk_size: int = 800, overlap: int = 150) -> Iterator[str]:
+    """Stream `url` and yield chunk_text()-identical chunks as soon as they are complete.
+
+    Only a rolling buffer of roughly `chunk_size + overlap` characters is held
+    in memory instead of the whole response body.
+    """
+    stride = chunk_size - overlap
+    throttle(url)
+    with get_http_client().stream("GET", url) as resp:
+        resp.raise_for_status()
+        buffer = ""
+        for piece in resp.iter_text():
+            buffer += piece
+            while len(buffer) >= chunk_size + overlap:
+                chunk = buffer[:chunk_size].strip()
+                if chunk:
+                    yield chunk
+                buffer = buffer[stride:]
+    yield from chunk_text(buffer, chunk_size=chunk_size, overlap=overlap)
 
 
 def generic_ingest_url(
@@ -102,20 +271,29 @@ def generic_ingest_url(
     collection_name: str,
     source_name: Optional[str] = None,
     chunk_size: int = 800,
-    batch_size: int = 64,
+    batch_size: int = 256,
 ) -> bool:
     """Generic ingest: download URL, extract text (HTML/PDF), chunk, embed, upsert to Qdrant.
 
     Returns True on success.
     """
     logger.info(f"Generic ingest for {url} -> {collection_name}")
+    version = source_version(url)
+    if is_unchanged(url, collection_name, version):
+        return True
+
     try:
-        resp = requests.get(url, timeout=30, stream=True)
+        resp = fetch(url)
         resp.raise_for_status()
     except Exception as e:
         logger.error(f"Failed to fetch {url}: {e}")
         return False
 
+    if version is None:
+        version = content_version(resp.content)
+        if is_unchanged(url, collection_name, version):
+            return True
+
     content_type = resp.headers.get("Content-Type", "")
     content = resp.content
 
@@ -138,25 +316,26 @@ def generic_ingest_url(
         logger.error("No chunks created")
         return False
 
-    # Prepare and upsert in batches
-    for i in range(0, len(chunks), batch_size):
-        batch = chunks[i : i + batch_size]
-        embeddings = get_embeddings(batch)
-        points = []
-        for j, (chunk, emb) in enumerate(zip(batch, embeddings)):
-            idx = i + j
-            pid = f"{int(time.time())}-{idx}"
-            payload = {
-                "source_name": source_name or "generic",
-                "source_url": url,
-                "ingestion_date": int(time.time()),
-                "chunk_index": idx,
-                "chunk_text": chunk,
-            }
-            points.append(PointStruct(id=pid, vector=emb, payload=payload))
-
-        qdrant_manager.create_collection(collection_name)
-        qdrant_manager.upsert_points(collection_name, points)
+    # Ensure the target collection exists once, not per batch
+    qdrant_manager.create_collection(collection_name)
+
+    # Embed everything once, then hand one flat point list to the uploader
+    embeddings = cached_get_embeddings(chunks)
+    points = []
+    for idx, (chunk, emb) in enumerate(zip(chunks, embeddings)):
+        pid = next_point_id()
+        payload = {
+            "source_name": source_name or "generic",
+            "source_url": url,
+            "ingestion_date": int(time.time()),
+            "chunk_index": idx,
+            **encode_chunk_text(chunk),
+        }
+        points.append(PointStruct(id=pid, vector=emb, payload=payload))
+
+    if not qdrant_manager.upload_points(collection_name, points, batch_size=batch_size):
+        return False
+    mark_ingested(url, collection_name, version, points[0].id)
 
     logger.info(f"Generic ingest complete for {url}")
     return True
@@ -1,8 +1,8 @@
 """Connector to fetch acts/sections from IndiaCode or similar sources.
 
 This module provides a lightweight downloader/parser that extracts text
-from HTML or PDF, chunks it, embeds by calling `utils.embeddings.get_embeddings`,
-and upserts vectors to Qdrant via `database.qdrant_client.qdrant_manager`.
+from HTML or PDF, chunks it, embeds via `utils.embeddings_cache.cached_get_embeddings`,
+and upserts vectors to Qdrant via `database.qdrant_db.qdrant_manager`.
 
 Usage:
     from connectors.indiacode_connector import ingest_act_from_url
@@ -12,52 +12,42 @@ import hashlib
 import logging
 import time
 import uuid
-from typing import List, Dict
 
-import requests
 from bs4 import BeautifulSoup
 from qdrant_client.models import PointStruct
 
-from utils.embeddings import get_embeddings
+from utils.embeddings_cache import cached_get_embeddings
+from utils.payload_codec import encode_chunk_text
 from database.qdrant_db import qdrant_manager
-from connectors.helpers import generic_ingest_url
+from connectors.helpers import (
+    chunk_text,
+    content_version,
+    extract_text_from_html_bytes,
+    fetch,
+    generic_ingest_url,
+    is_unchanged,
+    source_version,
+)
+from utils.ingest_state import ingested_sample_id, mark_ingested
 
 logger = logging.getLogger(__name__)
 
 
 def _download(url: str) -> bytes:
-    resp = requests.get(url, timeout=30)
+    resp = fetch(url)
     resp.raise_for_status()
     return resp.content
 
 
 def _extract_text_from_html(html_bytes: bytes) -> str:
-    soup = BeautifulSoup(html_bytes, "html.parser")
-    # Remove scripts/styles
-    for s in soup(["script", "style"]):
-        s.decompose()
-    text = "\n".join([p.get_text(separator=" ").strip() for p in soup.find_all(["p", "div", "pre", "section"])])
-    return text
-
-
-def chunk_text(text: str, chunk_size: int = 800, overlap: int = 150) -> List[str]:
-    chunks = []
-    start = 0
-    length = len(text)
-    while start < length:
-        end = min(start + chunk_size, length)
-        chunk = text[start:end].strip()
-        if chunk:
-            chunks.append(chunk)
-        if end == length:
-            break
-        start = max(0, end - overlap)
-    return chunks
+    return extract_text_from_html_bytes(html_bytes)
 
 
 def _make_chunk_id(source_url: str, idx: int, chunk_text: str) -> str:
+    # Deterministic so re-ingesting a page overwrites its chunks; Qdrant string
+    # IDs must be UUIDs, so the digest is formatted as one.
     h = hashlib.sha1(f"{source_url}|{idx}|{chunk_text[:120]}".encode("utf-8")).hexdigest()
-    return h
+    return str(uuid.UUID(h[:32]))
 
 
 def ingest_act_from_url(url: str, collection_name: str = "statutes_vectors", chunk_size: int = 800):
@@ -68,14 +58,22 @@ def ingest_act_from_url(url: str, collection_name: str = "statutes_vectors", chu
     includes OCR fallback. If no PDF is found, it extracts HTML text and ingests.
     """
     logger.info(f"Ingesting act from: {url}")
+    version = source_version(url)
+    if is_unchanged(url, collection_name, version):
+        return True
 
     try:
-        resp = requests.get(url, timeout=30)
+        resp = fetch(url)
         resp.raise_for_status()
     except Exception as e:
         logger.error(f"Failed to fetch {url}: {e}")
         return False
 
+    if version is None:
+        version = content_version(resp.content)
+        if is_unchanged(url, collection_name, version):
+            return True
+
     soup = BeautifulSoup(resp.content, "html.parser")
     pdf_link = None
     for a in soup.find_all("a", href=True):
@@ -90,7 +88,11 @@ def ingest_act_from_url(url: str, collection_name: str = "statutes_vectors", chu
 
             pdf_link = urljoin(url, pdf_link)
         logger.info(f"Found PDF link; delegating to generic ingest: {pdf_link}")
-        return generic_ingest_url(pdf_link, collection_name, source_name="indiacode")
+        if not generic_ingest_url(pdf_link, collection_name, source_name="indiacode"):
+            return False
+        # The page's points are the PDF's
+        mark_ingested(url, collection_name, version, ingested_sample_id(pdf_link, collection_name))
+        return True
 
     # No PDF found; fall back to HTML extraction and ingest
     text = _extract_text_from_html(resp.content)
@@ -103,26 +105,26 @@ def ingest_act_from_url(url: str, collection_name: str = "statutes_vectors", chu
         logger.error("No chunks created")
         return False
 
-    batch_size = 64
-    for i in range(0, len(chunks), batch_size):
-        batch = chunks[i : i + batch_size]
-        embeddings = get_embeddings(batch)
-        points = []
-        for idx, (chunk, emb) in enumerate(zip(batch, embeddings)):
-            chunk_index = i + idx
-            pid = _make_chunk_id(url, chunk_index, chunk)
-            payload = {
-                "source_name": "indiacode",
-                "source_url": url,
-                "ingestion_date": int(time.time()),
-                "chunk_index": chunk_index,
-                "chunk_text": chunk,
-                "jurisdiction": "india",
-            }
-            points.append(PointStruct(id=pid, vector=emb, payload=payload))
-
-        qdrant_manager.create_collection(collection_name)
-        qdrant_manager.upsert_points(collection_name, points)
+    # Ensure the target collection exists once, not per batch
+    qdrant_manager.create_collection(collection_name)
+
+    embeddings = cached_get_embeddings(chunks)
+    points = []
+    for chunk_index, (chunk, emb) in enumerate(zip(chunks, embeddings)):
+        pid = _make_chunk_id(url, chunk_index, chunk)
+        payload = {
+            "source_name": "indiacode",
+            "source_url": url,
+            "ingestion_date": int(time.time()),
+            "chunk_index": chunk_index,
+            **encode_chunk_text(chunk),
+            "jurisdiction": "india",
+        }
+        points.append(PointStruct(id=pid, vector=emb, payload=payload))
+
+    if not qdrant_manager.upload_points(collection_name, points):
+        return False
+    mark_ingested(url, collection_name, version, points[0].id)
 
     logger.info(f"Completed ingest for {url}")
     return True
@@ -6,64 +6,69 @@ to the `case_law_vectors` collection by default.
 import hashlib
 import logging
 import time
+import uuid
 from typing import List
 
-import requests
 from bs4 import BeautifulSoup
 from qdrant_client.models import PointStruct
 
-from utils.embeddings import get_embeddings
+from utils.embeddings_cache import cached_get_embeddings
+from utils.payload_codec import encode_chunk_text
 from database.qdrant_db import qdrant_manager
-from connectors.helpers import generic_ingest_url
+from connectors.helpers import (
+    chunk_text,
+    content_version,
+    extract_text_from_html_bytes,
+    fetch,
+    generic_ingest_url,
+    is_unchanged,
+    source_version,
+)
+from utils.ingest_state import ingested_sample_id, mark_ingested
 
 logger = logging.getLogger(__name__)
 
 
 def _download(url: str) -> bytes:
-    resp = requests.get(url, timeout=30)
+    resp = fetch(url)
     resp.raise_for_status()
     return resp.content
 
 
 def _extract_text(html_bytes: bytes) -> str:
-    soup = BeautifulSoup(html_bytes, "html.parser")
-    for s in soup(["script", "style"]):
-        s.decompose()
     # Supreme Court pages often put judgments inside <div class="JUDGMENT"> or <pre>
-    parts = soup.find_all(["pre", "div", "p"]) or [soup]
-    text = "\n".join([p.get_text(separator=" ").strip() for p in parts])
-    return text
+    return extract_text_from_html_bytes(html_bytes, tags=("pre", "div", "p"))
 
 
 def _chunk(text: str, chunk_size: int = 900, overlap: int = 200) -> List[str]:
-    chunks = []
-    start = 0
-    length = len(text)
-    while start < length:
-        end = min(start + chunk_size, length)
-        chunk = text[start:end].strip()
-        if chunk:
-            chunks.append(chunk)
-        if end == length:
-            break
-        start = max(0, end - overlap)
-    return chunks
+    return chunk_text(text, chunk_size=chunk_size, overlap=overlap)
 
 
 def _make_id(url: str, idx: int, snippet: str) -> str:
-    return hashlib.sha1(f"{url}|{idx}|{snippet[:120]}".encode("utf-8")).hexdigest()
+    # Deterministic UUID (Qdrant rejects arbitrary string IDs)
+    h = hashlib.sha1(f"{url}|{idx}|{snippet[:120]}".encode("utf-8")).hexdigest()
+    return str(uuid.UUID(h[:32]))
 
 
 def ingest_judgment(url: str, collection_name: str = "case_law_vectors") -> bool:
     logger.info(f"Ingesting judgment: {url}")
+    version = source_version(url)
+    if is_unchanged(url, collection_name, version):
+        return True
+
     try:
-        resp = requests.get(url, timeout=30)
+        resp = fetch(url)
         resp.raise_for_status()
         data = resp.content
     except Exception as e:
         logger.error(f"Download failed: {e}")
         return False
 
+    if version is None:
+        version = content_version(data)
+        if is_unchanged(url, collection_name, version):
+            return True
+
     # Check for PDF link on the page (prefer canonical PDF)
     try:
         soup = BeautifulSoup(data, "html.parser")
@@ -79,7 +84,11 @@ def ingest_judgment(url: str, collection_name: str = "case_law_vectors") -> bool
 
                 pdf_link = urljoin(url, pdf_link)
             logger.info(f"Found PDF link; delegating to generic ingest: {pdf_link}")
-            return generic_ingest_url(pdf_link, collection_name, source_name="supreme_court_of_india")
+            if not generic_ingest_url(pdf_link, collection_name, source_name="supreme_court_of_india"):
+                return False
+            # The page's points are the PDF's
+            mark_ingested(url, collection_name, version, ingested_sample_id(pdf_link, collection_name))
+            return True
     except Exception:
         pass
 
@@ -93,26 +102,26 @@ def ingest_judgment(url: str, collection_name: str = "case_law_vectors") -> bool
         logger.error("No chunks produced")
         return False
 
-    batch_size = 64
-    for i in range(0, len(chunks), batch_size):
-        batch = chunks[i : i + batch_size]
-        embeddings = get_embeddings(batch)
-        points = []
-        for j, (chunk, emb) in enumerate(zip(batch, embeddings)):
-            idx = i + j
-            pid = _make_id(url, idx, chunk)
-            payload = {
-                "source_name": "supreme_court_of_india",
-                "source_url": url,
-                "ingestion_date": int(time.time()),
-                "chunk_index": idx,
-                "chunk_text": chunk,
-                "jurisdiction": "india",
-            }
-            points.append(PointStruct(id=pid, vector=emb, payload=payload))
-
-        qdrant_manager.create_collection(collection_name)
-        qdrant_manager.upsert_points(collection_name, points)
+    # Ensure the target collection exists once, not per batch
+    qdrant_manager.create_collection(collection_name)
+
+    embeddings = cached_get_embeddings(chunks)
+    points = []
+    for idx, (chunk, emb) in enumerate(zip(chunks, embeddings)):
+        pid = _make_id(url, idx, chunk)
+        payload = {
+            "source_name": "supreme_court_of_india",
+            "source_url": url,
+            "ingestion_date": int(time.time()),
+            "chunk_index": idx,
+            **encode_chunk_text(chunk),
+            "jurisdiction": "india",
+        }
+        points.append(PointStruct(id=pid, vector=emb, payload=payload))
+
+    if not qdrant_manager.upload_points(collection_name, points):
+        return False
+    mark_ingested(url, collection_name, version, points[0].id)
 
     logger.info(f"Finished ingesting judgment {url}")
     return True
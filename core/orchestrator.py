@@ -171,7 +171,8 @@ class NyayaOrchestrator:
     def _reasoning_node(self, state: AgentState) -> AgentState:
         """GroqLLM synthesis node - combines all evidence into final response."""
         try:
-            from llm.groq_client import groq_llm
+            from llm.groq_client import get_groq_llm
+            groq_llm = get_groq_llm()
             
             # Get all context
             statutes = state["context"].get("statutes", [])
@@ -363,8 +364,9 @@ class NyayaOrchestrator:
         Returns:
             Structured response with LLM synthesis
         """
-        from llm.groq_client import groq_llm
-        from datetime import datetime
+        from llm.groq_client import get_groq_llm
+        groq_llm = get_groq_llm()
+        from datetime import datetime, timezone
         import uuid
         
         try:
@@ -472,7 +474,7 @@ class NyayaOrchestrator:
                     "agents_skipped": list(skip_agents),
                     "classification_method": router_output.metadata.get("classification_method", "unknown")
                 },
-                "generated_at": datetime.now().isoformat()
+                "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds")
             }
             
         except Exception as e:
@@ -501,12 +503,13 @@ class NyayaOrchestrator:
             - civic_action_recommendations
             - agent_trace
         """
-        from llm.groq_client import groq_llm
+        from llm.groq_client import get_groq_llm
+        groq_llm = get_groq_llm()
         from api.schemas import (
             StructuredQueryResponse, LLMReasonedAnswer, RetrievedEvidence,
             Statute, Case, SimilarCaseAnalysis, CivicRecommendation, AgentTrace
         )
-        from datetime import datetime
+        from datetime import datetime, timezone
         import uuid
         
         try:
@@ -654,7 +657,7 @@ class NyayaOrchestrator:
                 similar_case_analysis=similar_case_analysis,
                 civic_action_recommendations=civic_recommendations,
                 agent_trace=agent_trace,
-                generated_at=datetime.now().isoformat()
+                generated_at=datetime.now(timezone.utc).isoformat(timespec="seconds")
             )
             
             logger.info(f"✓ Structured response generated for case {response.case_id}")
@@ -9,12 +9,22 @@ NO multi-agent chaining. NO multiple LLM calls. ONE response.
 """
 
 import logging
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+from datetime import datetime, timezone
 import uuid
 
 logger = logging.getLogger(__name__)
 
+_UTC = timezone.utc
+
+# Collections searched for RAG context, in order; the first with hits wins
+_RETRIEVAL_COLLECTIONS: Tuple[str, ...] = (
+    "multimodal_legal_data",
+    "legal_taxonomy_vectors",
+    "statutes_vectors",
+    "unified_legal_vectors",
+)
+
 
 # =============================================================================
 # ADAPTIVE RAG HELPERS
@@ -71,6 +81,7 @@ def build_adaptive_context(query: str) -> Dict[str, Any]:
     # 2. Vector Retrieval (Qdrant)
     try:
         from utils.embeddings import get_embedding
+        from utils.payload_codec import decode_chunk_text
         
         # Generate query embedding first
         query_embedding = get_embedding(query)
@@ -78,9 +89,7 @@ def build_adaptive_context(query: str) -> Dict[str, Any]:
         
         # Search existing collections
         results = []
-        collections_to_try = ["multimodal_legal_data", "legal_taxonomy_vectors", "statutes_vectors", "unified_legal_vectors"]
-        
-        for coll in collections_to_try:
+        for coll in _RETRIEVAL_COLLECTIONS:
             try:
                 results = qdrant_manager.search(
                     collection_name=coll,
@@ -98,9 +107,13 @@ def build_adaptive_context(query: str) -> Dict[str, Any]:
         # Format results
         for r in results:
              payload = r.get("payload", {})
+             if "content" in payload:
+                 content = payload["content"]
+             else:
+                 content = decode_chunk_text(payload) or payload.get("summary", "")
              context["retrieved_docs"].append({
                  "title": payload.get("title", payload.get("name", "Document")),
-                 "content": payload.get("content", payload.get("chunk_text", payload.get("summary", "")))[:600],
+                 "content": content[:600],
                  "source": payload.get("source", payload.get("source_name", "Internal DB")),
                  "score": r.get("score", 0)
              })
@@ -145,36 +158,22 @@ def build_adaptive_context(query: str) -> Dict[str, Any]:
     return context
 
 
-def query(user_query: str, user_id: str = "anonymous") -> Dict[str, Any]:
-    """
-    Process a query with ADAPTIVE RAG (Single LLM Call).
-    """
-    from llm.groq_client import groq_llm
-    
-    try:
-        logger.info(f"🚀 Adaptive Query: {user_query[:50]}...")
-        
-        # 1. Initialize Memory
-        _init_memory_collection()
-        
-        # 2. Build Adaptive Context
-        context = build_adaptive_context(user_query)
-        
-        # 3. Get Memory Context
-        memory_context = _get_memory_context(user_id, user_query)
-        
-        # 4. Format for Prompt
-        db_text = "\n\n".join([f"Source: {d['title']}\nContent: {d.get('content', '')[:600]}" for d in context["retrieved_docs"]])
-        web_text = "\n\n".join([f"Source: {d['title']} ({d.get('url', 'No URL')})\nContent: {d.get('content', '')[:600]}" for d in context["web_results"]])
-        
-        # 5. Single LLM Generation (Adaptive RAG Prompt)
-        system_prompt = """You are a helpful legal & civic information assistant.
+ADAPTIVE_SYSTEM_PROMPT = """You are a helpful legal & civic information assistant.
 You explain concepts clearly in simple language.
 You use provided documents and web results when available.
 If none are available, you rely on general public knowledge.
 You do NOT provide legal advice."""
 
-        user_prompt = f"""USER QUERY: {user_query}
+
+def _build_prompt(user_query: str, context: Dict[str, Any], memory_context: str) -> str:
+    """Format retrieved context and memory into the single adaptive RAG prompt."""
+    db_text = "\n\n".join([f"Source: {d['title']}\nContent: {d.get('content', '')[:600]}" for d in context["retrieved_docs"]])
+    web_text = "\n\n".join([f"Source: {d['title']} ({d.get('url', 'No URL')})\nContent: {d.get('content', '')[:600]}" for d in context["web_results"]])
+
+    # System prompt is part of the one f-string, so the full prompt is built once
+    return f"""{ADAPTIVE_SYSTEM_PROMPT}
+
+USER QUERY: {user_query}
 
 INTENT: {context['intent']}
 
@@ -213,34 +212,62 @@ REQUIRED OUTPUT FORMAT:
 ### Disclaimer
 (Brief legal disclaimer)"""
 
-        # Call LLM
+
+def _build_result(user_query: str, context: Dict[str, Any], response: str) -> Dict[str, Any]:
+    """Assemble the API result dict for a generated response."""
+    return {
+        "case_id": str(uuid.uuid4()),
+        "query": user_query,
+        "response": response,
+        "sources": {
+            "database_docs": len(context["retrieved_docs"]),
+            "web_results": len(context["web_results"]),
+            "source_type": context["context_source"],
+            "retrieval_status": "hit" if context["retrieved_docs"] else "miss"
+        },
+        "retrieved_docs": context["retrieved_docs"][:3],
+        "web_results": context["web_results"][:3],
+        "generated_at": datetime.now(_UTC).isoformat(timespec="seconds")
+    }
+
+
+def query(user_query: str, user_id: str = "anonymous") -> Dict[str, Any]:
+    """
+    Process a query with ADAPTIVE RAG (Single LLM Call).
+    """
+    from llm.groq_client import get_groq_llm
+    groq_llm = get_groq_llm()
+    
+    try:
+        logger.info(f"🚀 Adaptive Query: {user_query[:50]}...")
+        
+        # 1. Initialize Memory
+        _init_memory_collection()
+        
+        # 2. Build Adaptive Context
+        context = build_adaptive_context(user_query)
+        
+        # 3. Get Memory Context
+        memory_context = _get_memory_context(user_id, user_query)
+        
+        # 4. Format for Prompt
+        prompt = _build_prompt(user_query, context, memory_context)
+
+        # 5. Single LLM Generation (Adaptive RAG Prompt)
         if groq_llm is None:
             logger.warning("LLM not available, returning context only")
             return _fallback_response(user_query, context)
             
         logger.info("💬 Generating Adaptive Response...")
         response = groq_llm.generate_response(
-            prompt=f"{system_prompt}\n\n{user_prompt}", 
+            prompt=prompt, 
             temperature=0.3
         )
         
         # Store interaction
         _store_interaction(user_id, user_query, response)
         
-        return {
-            "case_id": str(uuid.uuid4()),
-            "query": user_query,
-            "response": response,
-            "sources": {
-                "database_docs": len(context["retrieved_docs"]),
-                "web_results": len(context["web_results"]),
-                "source_type": context["context_source"],
-                "retrieval_status": "hit" if context["retrieved_docs"] else "miss"
-            },
-            "retrieved_docs": context["retrieved_docs"][:3],
-            "web_results": context["web_results"][:3],
-            "generated_at": datetime.now().isoformat()
-        }
+        return _build_result(user_query, context, response)
 
     except Exception as e:
         logger.error(f"Pipeline Error: {e}")
@@ -252,6 +279,56 @@ REQUIRED OUTPUT FORMAT:
         }
 
 
+def query_stream(user_query: str, user_id: str = "anonymous") -> Iterator[Dict[str, Any]]:
+    """
+    Streaming variant of query().
+
+    Yields {"event": "token", "data": str} for each response fragment as the
+    LLM produces it, then a single {"event": "result", "data": dict} carrying
+    the same payload query() would return.
+    """
+    from llm.groq_client import get_groq_llm
+    groq_llm = get_groq_llm()
+
+    try:
+        logger.info(f"🚀 Adaptive Query (stream): {user_query[:50]}...")
+
+        _init_memory_collection()
+        context = build_adaptive_context(user_query)
+        memory_context = _get_memory_context(user_id, user_query)
+        prompt = _build_prompt(user_query, context, memory_context)
+
+        if groq_llm is None:
+            logger.warning("LLM not available, returning context only")
+            result = _fallback_response(user_query, context)
+            yield {"event": "token", "data": result["response"]}
+            yield {"event": "result", "data": result}
+            return
+
+        logger.info("💬 Streaming Adaptive Response...")
+        parts = []
+        for token in groq_llm.stream_response(prompt=prompt, temperature=0.3):
+            parts.append(token)
+            yield {"event": "token", "data": token}
+
+        response = "".join(parts)
+        _store_interaction(user_id, user_query, response)
+
+        yield {"event": "result", "data": _build_result(user_query, context, response)}
+
+    except Exception as e:
+        logger.error(f"Pipeline Error: {e}")
+        yield {
+            "event": "result",
+            "data": {
+                "case_id": str(uuid.uuid4()),
+                "query": user_query,
+                "response": "I encountered an error processing your request.",
+                "error": str(e)
+            }
+        }
+
+
 def _format_db_context(docs: List[Dict[str, Any]]) -> str:
     """Format database documents for LLM prompt."""
     if not docs:
@@ -325,7 +402,7 @@ def _fallback_response(query: str, context: Dict[str, Any]) -> Dict[str, Any]:
         },
         "retrieved_docs": context["retrieved_docs"][:3],
         "web_results": context["web_results"][:3],
-        "generated_at": datetime.now().isoformat(),
+        "generated_at": datetime.now(_UTC).isoformat(timespec="seconds"),
         "fallback": True
     }
 
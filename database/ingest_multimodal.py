@@ -18,25 +18,31 @@ import os
 # Add parent directory to sys.path to allow importing from project root
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
 import uuid
 import json
-import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from bs4 import BeautifulSoup
 import re
 from sentence_transformers import SentenceTransformer
 
-logging.basicConfig(level=logging.INFO)
+from utils.log_queue import setup_queue_logging
+
+setup_queue_logging(logging.INFO)
 logger = logging.getLogger(__name__)
 
-from database.qdrant_db import qdrant_manager
+from database.qdrant_db import next_point_id, qdrant_manager
 
 
 # Supported data types
 DATA_TYPES = ["text", "pdf", "image", "audio", "video", "code", "form"]
 
+# Keys every ingest_documents() entry must carry (ingest_document()'s positional arguments)
+REQUIRED_DOC_KEYS = ("content", "data_type", "title")
+
 
 # =============================================================================
 # REAL DATA FETCHING FUNCTIONS
@@ -632,9 +638,7 @@ def fetch_legal_videos_audio() -> List[Dict[str, Any]]:
 def ingest_real_legal_data():
     """Ingest real legal data from all sources."""
     
-    logger.info("\n" + "="*60)
-    logger.info("INGESTING REAL LEGAL DATA")
-    logger.info("="*60 + "\n")
+    logger.info("\n".join(["\n" + "="*60, "INGESTING REAL LEGAL DATA", "="*60 + "\n"]))
     
     # Create collection first and get client
     client = create_multimodal_collection()
@@ -650,12 +654,9 @@ def ingest_real_legal_data():
     all_data.extend(fetch_legal_forms())
     all_data.extend(fetch_legal_videos_audio())
     
-    # Ingest all data
-    success_count = 0
-    for item in all_data:
-        doc_id = ingest_document(**item)
-        if doc_id:
-            success_count += 1
+    # Ingest all data; batches are upserted concurrently
+    with qdrant_manager.bulk_load(["multimodal_legal_data"]):
+        success_count = asyncio.run(aingest_documents(all_data))
     
     logger.info(f"\n✓ Ingested {success_count}/{len(all_data)} real legal documents")
     return success_count
@@ -681,6 +682,32 @@ def create_multimodal_collection():
         return None
 
 
+def _build_payload(
+    doc_id: Union[int, str],
+    content: str,
+    data_type: str,
+    title: str,
+    source: str = "",
+    category: str = "",
+    metadata: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Build the Qdrant payload (rich metadata) for a multimodal document.
+    
+    The payload "id" is always a string, whether the point id is a UUID
+    (ingest_document) or a run-prefixed integer (ingest_documents).
+    """
+    return {
+        "id": str(doc_id),
+        "title": title,
+        "content": content[:2000],  # Limit content size
+        "data_type": data_type,
+        "source": source,
+        "category": category,
+        "created_at": datetime.now().isoformat(),
+        **(metadata or {})
+    }
+
+
 def ingest_document(
     content: str,
     data_type: str,
@@ -692,6 +719,9 @@ def ingest_document(
 ) -> Optional[str]:
     """
     Ingest a single document into Qdrant.
+    
+    For more than a handful of documents prefer ingest_documents(), which
+    embeds and upserts in batches.
     """
     from qdrant_client.models import PointStruct
     
@@ -706,16 +736,7 @@ def ingest_document(
         
         # Build payload with rich metadata
         doc_id = str(uuid.uuid4())
-        payload = {
-            "id": doc_id,
-            "title": title,
-            "content": content[:2000],  # Limit content size
-            "data_type": data_type,
-            "source": source,
-            "category": category,
-            "created_at": datetime.now().isoformat(),
-            **(metadata or {})
-        }
+        payload = _build_payload(doc_id, content, data_type, title, source, category, metadata)
         
         # Upsert to Qdrant using qdrant_manager
         qdrant_manager.upsert_points(
@@ -727,7 +748,7 @@ def ingest_document(
             )]
         )
         
-        logger.info(f"✓ Ingested [{data_type}]: {title}")
+        logger.debug(f"✓ Ingested [{data_type}]: {title}")
         return doc_id
         
     except Exception as e:
@@ -735,6 +756,99 @@ def ingest_document(
         return None
 
 
+def _build_points(documents: List[Dict[str, Any]]) -> List[Any]:
+    """
+    Validate documents and embed them in one pass into PointStructs.
+    
+    Each entry takes the same keys as ingest_document(). Entries missing
+    "content", "data_type" or "title" are logged and skipped.
+    """
+    from qdrant_client.models import PointStruct
+    from utils.embeddings_cache import cached_get_embeddings
+    
+    valid_docs = []
+    for i, doc in enumerate(documents):
+        missing = [key for key in REQUIRED_DOC_KEYS if key not in doc]
+        if missing:
+            logger.warning(f"Skipping document #{i} ({doc.get('title', 'untitled')}): missing {', '.join(missing)}")
+        elif not isinstance(doc["content"], str):
+            logger.warning(f"Skipping document #{i} ({doc['title']}): content is not text")
+        else:
+            valid_docs.append(doc)
+    
+    if not valid_docs:
+        return []
+    
+    embeddings = cached_get_embeddings([doc["content"][:1000] for doc in valid_docs])
+    
+    points = []
+    for doc, embedding in zip(valid_docs, embeddings):
+        data_type = doc["data_type"]
+        if data_type not in DATA_TYPES:
+            logger.warning(f"Unknown data type: {data_type}, using 'text'")
+            data_type = "text"
+        
+        doc_id = next_point_id()
+        payload = _build_payload(
+            doc_id,
+            doc["content"],
+            data_type,
+            doc["title"],
+            doc.get("source", ""),
+            doc.get("category", ""),
+            doc.get("metadata")
+        )
+        points.append(PointStruct(id=doc_id, vector=embedding, payload=payload))
+    return points
+
+
+def ingest_documents(documents: List[Dict[str, Any]], batch_size: int = 256) -> int:
+    """
+    Ingest many documents with one embedding pass and batched upserts.
+    
+    Invalid entries are skipped (see _build_points()); the rest are still
+    stored. Safe to call from any thread; async callers should use
+    aingest_documents() instead. Returns the number of documents stored.
+    """
+    try:
+        points = _build_points(documents)
+        if not points:
+            return 0
+        
+        if not qdrant_manager.upsert_points("multimodal_legal_data", points, batch_size=batch_size):
+            return 0
+        
+        logger.info(f"✓ Ingested {len(points)} documents into multimodal_legal_data")
+        return len(points)
+        
+    except Exception as e:
+        logger.error(f"Error ingesting documents: {e}")
+        return 0
+
+
+async def aingest_documents(documents: List[Dict[str, Any]], batch_size: int = 256) -> int:
+    """
+    Async variant of ingest_documents(); batches are upserted concurrently.
+    
+    Embedding runs in a worker thread so the event loop is not blocked.
+    The ingest stages run it with asyncio.run() from main().
+    """
+    try:
+        points = await asyncio.to_thread(_build_points, documents)
+        if not points:
+            return 0
+        
+        if not await qdrant_manager.aupsert_points("multimodal_legal_data", points, batch_size=batch_size):
+            return 0
+        
+        logger.info(f"✓ Ingested {len(points)} documents into multimodal_legal_data")
+        return len(points)
+        
+    except Exception as e:
+        logger.error(f"Error ingesting documents: {e}")
+        return 0
+
+
 def ingest_sample_multimodal_data():
     """Ingest sample multimodal data for demonstration."""
     
@@ -923,12 +1037,9 @@ def ingest_sample_multimodal_data():
         logger.error("Failed to create collection or connect to Qdrant")
         return 0
     
-    # Ingest all samples
-    success_count = 0
-    for sample in samples:
-        doc_id = ingest_document(**sample)
-        if doc_id:
-            success_count += 1
+    # Ingest all samples; batches are upserted concurrently
+    with qdrant_manager.bulk_load(["multimodal_legal_data"]):
+        success_count = asyncio.run(aingest_documents(samples))
     
     logger.info(f"\n✓ Ingested {success_count}/{len(samples)} multimodal documents")
     return success_count
@@ -973,6 +1084,40 @@ def search_multimodal(
         return []
 
 
+def search_multimodal_batch(
+    searches: List[Dict[str, Any]],
+    limit: int = 5
+) -> List[List[Dict[str, Any]]]:
+    """
+    Run several multimodal searches in a single Qdrant round trip.
+    
+    Each entry takes the same keys as search_multimodal() ("query", and
+    optionally "data_type" / "category"). Returns one result list per entry.
+    """
+    from utils.embeddings import get_embeddings
+    
+    try:
+        # Shared, already-loaded model (and its query cache) instead of a fresh load per call
+        query_embeddings = get_embeddings([search["query"] for search in searches])
+        
+        filter_dicts = []
+        for search in searches:
+            filter_dict = {k: search[k] for k in ("data_type", "category") if search.get(k)}
+            filter_dicts.append(filter_dict or None)
+        
+        return qdrant_manager.search_batch(
+            collection_name="multimodal_legal_data",
+            query_vectors=query_embeddings,
+            limit=limit,
+            score_threshold=0.3,
+            filter_dicts=filter_dicts
+        )
+        
+    except Exception as e:
+        logger.error(f"Batch search error: {e}")
+        return [[] for _ in searches]
+
+
 # =============================================================================
 # CONNECTOR INTEGRATION
 # =============================================================================
@@ -981,11 +1126,13 @@ try:
     from connectors.indiacode_connector import ingest_act_from_url
     from connectors.supremecourt_connector import ingest_judgment
     from connectors.data_gov_connector import ingest_from_datagov_dataset
+    from connectors.helpers import close_http_client
 except ImportError as e:
     logger.warning(f"Could not import connectors: {e}")
     ingest_act_from_url = None
     ingest_judgment = None
     ingest_from_datagov_dataset = None
+    close_http_client = None
 
 def ingest_from_connectors():
     """Ingest data using specialized connectors for real-world sources."""
@@ -1000,17 +1147,35 @@ def ingest_from_connectors():
         "https://www.indiacode.nic.in/handle/123456789/2065", # RTI Act default handle
         "https://www.indiacode.nic.in/handle/123456789/1999"  # Information Technology Act
     ]
-    for url in acts:
-        logger.info(f"Using IndiaCode connector for: {url}")
-        ingest_act_from_url(url, collection_name="unified_legal_vectors")
 
     # 2. Supreme Court Judgments (Examples)
     judgments = [
         "https://main.sci.gov.in/supremecourt/2023/12345/judgment.pdf", # Placeholder real URL structure
     ]
-    for url in judgments:
-        logger.info(f"Using Supreme Court connector for: {url}")
-        ingest_judgment(url, collection_name="unified_legal_vectors")
+
+    jobs = [("IndiaCode", ingest_act_from_url, url) for url in acts]
+    jobs += [("Supreme Court", ingest_judgment, url) for url in judgments]
+
+    # Run all URLs concurrently; connectors.helpers.fetch rate-limits per host,
+    # so different sites proceed in parallel while each host stays throttled.
+    def _run(job):
+        name, ingest_fn, url = job
+        logger.debug(f"Using {name} connector for: {url}")
+        return ingest_fn(url, collection_name="unified_legal_vectors")
+
+    qdrant_manager.create_collection("unified_legal_vectors")
+    try:
+        with qdrant_manager.bulk_load(["unified_legal_vectors"]):
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = {executor.submit(_run, job): job for job in jobs}
+                for future in as_completed(futures):
+                    name, _, url = futures[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error(f"{name} connector failed for {url}: {e}")
+    finally:
+        close_http_client()
 
     logger.info("✅ Connector ingestion complete.")
 
@@ -1031,13 +1196,13 @@ def main():
 
     # Test Search
     print("\n🔎 Running Test Queries...")
-    results = search_multimodal("RTI application process")
-    for r in results:
-        print(f"- [{r['score']:.2f}] {r['payload'].get('title', 'No Title')} ({r['payload'].get('data_type')})")
-
-    results_v = search_multimodal("courtroom argument audio", data_type="audio")
-    for r in results_v:
-        print(f"- [{r['score']:.2f}] {r['payload'].get('title', 'No Title')} ({r['payload'].get('data_type')})")
+    test_searches = [
+        {"query": "RTI application process"},
+        {"query": "courtroom argument audio", "data_type": "audio"},
+    ]
+    for results in search_multimodal_batch(test_searches):
+        for r in results:
+            print(f"- [{r['score']:.2f}] {r['payload'].get('title', 'No Title')} ({r['payload'].get('data_type')})")
 
 if __name__ == "__main__":
     main()
@@ -1,13 +1,18 @@
 """Script to ingest sample legal data into Qdrant collections."""
+import hashlib
+import json
 import logging
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+import numpy as np
 from qdrant_client.models import PointStruct
 import uuid
 
-from .qdrant_client import qdrant_manager
-from utils.embeddings import get_embeddings
+from .qdrant_db import qdrant_manager
+from utils.embeddings_cache import cached_get_embeddings
+from utils.log_queue import setup_queue_logging
 
-logging.basicConfig(level=logging.INFO)
+setup_queue_logging(logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -202,144 +207,177 @@ SAMPLE_CIVIC_PROCESSES = [
 ]
 
 
-def ingest_taxonomy():
-    """Ingest legal taxonomy data."""
-    logger.info("Ingesting legal taxonomy data...")
-    
-    texts = [item["text"] for item in SAMPLE_TAXONOMY]
-    embeddings = get_embeddings(texts)
-    
-    points = []
-    for i, (item, embedding) in enumerate(zip(SAMPLE_TAXONOMY, embeddings)):
-        point = PointStruct(
-            id=str(uuid.uuid4()),
-            vector=embedding,
-            payload={
-                "text": item["text"],
-                "domain": item["domain"],
-                "description": item["description"],
-                "source": "sample_data",
-                "agent_name": "ingestion",
-                "confidence": 1.0
-            }
-        )
-        points.append(point)
+def _content_id(item: Dict[str, Any]) -> str:
+    """Derive a stable point ID from the SHA-256 of an item's content."""
+    digest = hashlib.sha256(json.dumps(item, sort_keys=True).encode("utf-8")).hexdigest()
+    return str(uuid.UUID(digest[:32]))
+
+
+def _pending_items(collection_name: str, items: List[Dict[str, Any]]) -> List[Tuple[str, Dict[str, Any]]]:
+    """Return (point_id, item) pairs not yet stored in the collection.
     
-    success = qdrant_manager.upsert_points("legal_taxonomy_vectors", points)
-    logger.info(f"✓ Ingested {len(points)} taxonomy entries")
+    Unchanged items keep the same content-hash ID across runs, so re-running
+    the ingestion only embeds and upserts new or modified entries.
+    """
+    ids = [_content_id(item) for item in items]
+    existing = qdrant_manager.get_existing_ids(collection_name, ids)
+    pending = [(point_id, item) for point_id, item in zip(ids, items) if point_id not in existing]
+    if len(pending) < len(items):
+        logger.info(f"  Skipping {len(items) - len(pending)} unchanged entries in {collection_name}")
+    return pending
+
+
+def _taxonomy_payload(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "text": item["text"],
+        "domain": item["domain"],
+        "description": item["description"],
+        "source": "sample_data",
+        "agent_name": "ingestion",
+        "confidence": 1.0
+    }
+
+
+def _statute_payload(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "title": item["title"],
+        "section": item["section"],
+        "act_name": item["act_name"],
+        "content": item["content"],
+        "text": item["text"],
+        "domain": item["domain"],
+        "jurisdiction": item["jurisdiction"],
+        "source": "sample_data",
+        "agent_name": "ingestion",
+        "confidence": 1.0
+    }
+
+
+def _case_payload(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "case_name": item["case_name"],
+        "court": item["court"],
+        "year": item["year"],
+        "summary": item["summary"],
+        "key_points": item["key_points"],
+        "citation": item["citation"],
+        "text": item["text"],
+        "domain": item["domain"],
+        "source": "sample_data",
+        "agent_name": "ingestion",
+        "confidence": 1.0
+    }
+
+
+def _civic_process_payload(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "action": item["action"],
+        "description": item["description"],
+        "steps": item["steps"],
+        "authority": item["authority"],
+        "required_documents": item["required_documents"],
+        "timeline": item["timeline"],
+        "cost": item["cost"],
+        "text": item["text"],
+        "domain": item["domain"],
+        "source": "sample_data",
+        "agent_name": "ingestion",
+        "confidence": 1.0
+    }
+
+
+# result key -> (collection, sample items, payload builder, log label)
+SAMPLE_SETS: Dict[str, Tuple[str, List[Dict[str, Any]], Callable[[Dict[str, Any]], Dict[str, Any]], str]] = {
+    "taxonomy": ("legal_taxonomy_vectors", SAMPLE_TAXONOMY, _taxonomy_payload, "taxonomy"),
+    "statutes": ("statutes_vectors", SAMPLE_STATUTES, _statute_payload, "statute"),
+    "cases": ("case_law_vectors", SAMPLE_CASES, _case_payload, "case law"),
+    "civic_processes": ("civic_process_vectors", SAMPLE_CIVIC_PROCESSES, _civic_process_payload, "civic process"),
+}
+
+
+def _upsert_pending(
+    name: str,
+    pending: List[Tuple[str, Dict[str, Any]]],
+    embeddings: np.ndarray
+) -> bool:
+    """Build points for already-embedded pending items and upsert them."""
+    collection_name, _, build_payload, label = SAMPLE_SETS[name]
+    points = [
+        PointStruct(id=point_id, vector=embedding, payload=build_payload(item))
+        for (point_id, item), embedding in zip(pending, embeddings)
+    ]
+    success = qdrant_manager.upsert_points(collection_name, points)
+    logger.info(f"✓ Ingested {len(points)} {label} entries")
     return success
 
 
+def _ingest_sample_set(name: str) -> bool:
+    """Embed and upsert the pending entries of a single sample set."""
+    collection_name, items, _, label = SAMPLE_SETS[name]
+    logger.info(f"Ingesting {label} data...")
+
+    pending = _pending_items(collection_name, items)
+    if not pending:
+        logger.info(f"✓ All {label} entries already ingested")
+        return True
+
+    embeddings = cached_get_embeddings([item["text"] for _, item in pending])
+    return _upsert_pending(name, pending, embeddings)
+
+
+def ingest_taxonomy():
+    """Ingest legal taxonomy data."""
+    return _ingest_sample_set("taxonomy")
+
+
 def ingest_statutes():
     """Ingest statutes data."""
-    logger.info("Ingesting statutes data...")
-    
-    texts = [item["text"] for item in SAMPLE_STATUTES]
-    embeddings = get_embeddings(texts)
-    
-    points = []
-    for i, (item, embedding) in enumerate(zip(SAMPLE_STATUTES, embeddings)):
-        point = PointStruct(
-            id=str(uuid.uuid4()),
-            vector=embedding,
-            payload={
-                "title": item["title"],
-                "section": item["section"],
-                "act_name": item["act_name"],
-                "content": item["content"],
-                "text": item["text"],
-                "domain": item["domain"],
-                "jurisdiction": item["jurisdiction"],
-                "source": "sample_data",
-                "agent_name": "ingestion",
-                "confidence": 1.0
-            }
-        )
-        points.append(point)
-    
-    success = qdrant_manager.upsert_points("statutes_vectors", points)
-    logger.info(f"✓ Ingested {len(points)} statute entries")
-    return success
+    return _ingest_sample_set("statutes")
 
 
 def ingest_cases():
     """Ingest case law data."""
-    logger.info("Ingesting case law data...")
-    
-    texts = [item["text"] for item in SAMPLE_CASES]
-    embeddings = get_embeddings(texts)
-    
-    points = []
-    for i, (item, embedding) in enumerate(zip(SAMPLE_CASES, embeddings)):
-        point = PointStruct(
-            id=str(uuid.uuid4()),
-            vector=embedding,
-            payload={
-                "case_name": item["case_name"],
-                "court": item["court"],
-                "year": item["year"],
-                "summary": item["summary"],
-                "key_points": item["key_points"],
-                "citation": item["citation"],
-                "text": item["text"],
-                "domain": item["domain"],
-                "source": "sample_data",
-                "agent_name": "ingestion",
-                "confidence": 1.0
-            }
-        )
-        points.append(point)
-    
-    success = qdrant_manager.upsert_points("case_law_vectors", points)
-    logger.info(f"✓ Ingested {len(points)} case law entries")
-    return success
+    return _ingest_sample_set("cases")
 
 
 def ingest_civic_processes():
     """Ingest civic process data."""
-    logger.info("Ingesting civic process data...")
-    
-    texts = [item["text"] for item in SAMPLE_CIVIC_PROCESSES]
-    embeddings = get_embeddings(texts)
-    
-    points = []
-    for i, (item, embedding) in enumerate(zip(SAMPLE_CIVIC_PROCESSES, embeddings)):
-        point = PointStruct(
-            id=str(uuid.uuid4()),
-            vector=embedding,
-            payload={
-                "action": item["action"],
-                "description": item["description"],
-                "steps": item["steps"],
-                "authority": item["authority"],
-                "required_documents": item["required_documents"],
-                "timeline": item["timeline"],
-                "cost": item["cost"],
-                "text": item["text"],
-                "domain": item["domain"],
-                "source": "sample_data",
-                "agent_name": "ingestion",
-                "confidence": 1.0
-            }
-        )
-        points.append(point)
-    
-    success = qdrant_manager.upsert_points("civic_process_vectors", points)
-    logger.info(f"✓ Ingested {len(points)} civic process entries")
-    return success
+    return _ingest_sample_set("civic_processes")
 
 
 def ingest_all():
-    """Ingest all sample data."""
+    """Ingest all sample data.
+
+    Pending entries from every collection are embedded in a single batch,
+    then the vectors are split back per collection. The collections are
+    independent, so their existence checks and upserts run concurrently.
+    """
     logger.info("Starting sample data ingestion...")
-    
-    results = {
-        "taxonomy": ingest_taxonomy(),
-        "statutes": ingest_statutes(),
-        "cases": ingest_cases(),
-        "civic_processes": ingest_civic_processes()
-    }
-    
+
+    collections = [spec[0] for spec in SAMPLE_SETS.values()]
+    results = {}
+    with qdrant_manager.bulk_load(collections), ThreadPoolExecutor(max_workers=len(SAMPLE_SETS)) as executor:
+        pending = dict(zip(
+            SAMPLE_SETS,
+            executor.map(lambda spec: _pending_items(spec[0], spec[1]), SAMPLE_SETS.values())
+        ))
+        embeddings = cached_get_embeddings(
+            [item["text"] for entries in pending.values() for _, item in entries]
+        )
+
+        futures = {}
+        offset = 0
+        for name, entries in pending.items():
+            if not entries:
+                logger.info(f"✓ All {SAMPLE_SETS[name][3]} entries already ingested")
+                results[name] = True
+                continue
+            futures[name] = executor.submit(
+                _upsert_pending, name, entries, embeddings[offset:offset + len(entries)]
+            )
+            offset += len(entries)
+        results.update((name, future.result()) for name, future in futures.items())
+
     logger.info("Sample data ingestion complete!")
     return results
 
@@ -1,19 +1,36 @@
 """Qdrant client wrapper and utilities."""
-from typing import List, Dict, Any, Optional
+import asyncio
+import itertools
+import random
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Dict, Any, Optional, Set
 import logging
 
 from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Point IDs for bulk ingestion: a random 32-bit prefix per process in the high
+# half of an unsigned 64-bit integer (Qdrant's integer ID range) and a
+# counter in the low half. next() on itertools.count is atomic under the GIL.
+_RUN_PREFIX = random.getrandbits(32)
+_point_counter = itertools.count()
+
+
+def next_point_id() -> int:
+    """Return a new unique unsigned 64-bit point ID without a urandom call per point."""
+    return (_RUN_PREFIX << 32) | (next(_point_counter) & 0xFFFFFFFF)
+
 # Optional imports - handle gracefully if qdrant_client is not installed
 try:
-    from qdrant_client import QdrantClient
+    from qdrant_client import AsyncQdrantClient, QdrantClient
     from qdrant_client.models import Distance, VectorParams, PointStruct
     QDRANT_AVAILABLE = True
 except ImportError:
     logger.warning("qdrant_client not installed. Qdrant operations will not work.")
     QdrantClient = None
+    AsyncQdrantClient = None
     Distance = None
     VectorParams = None
     PointStruct = None
@@ -26,6 +43,7 @@ class QdrantManager:
     def __init__(self):
         """Initialize Qdrant client (lazy connection)."""
         self._client = None
+        self._client_lock = threading.Lock()
         self._connected = False
     
     @property
@@ -35,51 +53,78 @@ class QdrantManager:
             raise ImportError("qdrant_client package is not installed. Install it with: pip install qdrant-client")
         
         if self._client is None:
-            try:
-                # For local Qdrant, don't use HTTPS or API key
-                # For cloud Qdrant, use URL and API key
-                if settings.qdrant_api_key:
-                    # Cloud Qdrant
-                    self._client = QdrantClient(
-                        url=f"https://{settings.qdrant_host}",
-                        api_key=settings.qdrant_api_key,
-                    )
-                    logger.info(f"Connected to cloud Qdrant")
-                else:
-                    # Local Qdrant (default)
-                    # Don't use timeout in constructor - it might cause issues
-                    # Connection will be tested on first operation
-                    self._client = QdrantClient(
-                        host=settings.qdrant_host,
-                        port=settings.qdrant_port,
-                    )
-                    # Test connection with a simple operation
+            # Concurrent first use (thread-pool fan-outs) must build one client
+            with self._client_lock:
+                if self._client is None:
                     try:
-                        self._client.get_collections()
-                        logger.info(f"Connected to local Qdrant at {settings.qdrant_host}:{settings.qdrant_port}")
-                    except Exception as conn_err:
-                        logger.warning(f"Qdrant connection test failed: {conn_err}")
-                        logger.info("Qdrant may not be running. Start with: docker compose up -d qdrant")
-                        # Keep client but mark as potentially unavailable
+                        # For local Qdrant, don't use HTTPS or API key
+                        # For cloud Qdrant, use URL and API key
+                        if settings.qdrant_api_key:
+                            # Cloud Qdrant
+                            self._client = QdrantClient(
+                                url=f"https://{settings.qdrant_host}",
+                                api_key=settings.qdrant_api_key,
+                            )
+                            logger.info(f"Connected to cloud Qdrant")
+                        else:
+                            # Local Qdrant (default)
+                            # Don't use timeout in constructor - it might cause issues
+                            # Connection will be tested on first operation
+                            self._client = QdrantClient(
+                                host=settings.qdrant_host,
+                                port=settings.qdrant_port,
+                            )
+                            # Test connection with a simple operation
+                            try:
+                                self._client.get_collections()
+                                logger.info(f"Connected to local Qdrant at {settings.qdrant_host}:{settings.qdrant_port}")
+                            except Exception as conn_err:
+                                logger.warning(f"Qdrant connection test failed: {conn_err}")
+                                logger.info("Qdrant may not be running. Start with: docker compose up -d qdrant")
+                                # Keep client but mark as potentially unavailable
+                                self._connected = False
+                                raise ConnectionError(f"Qdrant not available at {settings.qdrant_host}:{settings.qdrant_port}. Start Docker: docker compose up -d qdrant")
+                        self._connected = True
+                    except (ConnectionError, ImportError):
+                        # Re-raise connection/import errors
+                        raise
+                    except Exception as e:
+                        logger.warning(f"Could not connect to Qdrant: {e}. Operations will fail gracefully.")
                         self._connected = False
-                        raise ConnectionError(f"Qdrant not available at {settings.qdrant_host}:{settings.qdrant_port}. Start Docker: docker compose up -d qdrant")
-                self._connected = True
-            except (ConnectionError, ImportError):
-                # Re-raise connection/import errors
-                raise
-            except Exception as e:
-                logger.warning(f"Could not connect to Qdrant: {e}. Operations will fail gracefully.")
-                self._connected = False
-                raise ConnectionError(f"Qdrant not available: {e}")
+                        raise ConnectionError(f"Qdrant not available: {e}")
         return self._client
     
+    def _make_async_client(self) -> "AsyncQdrantClient":
+        """Build an async Qdrant client with the same connection settings as `client`.
+        
+        Not cached: an async client is bound to the event loop it first runs on.
+        """
+        if not QDRANT_AVAILABLE:
+            raise ImportError("qdrant_client package is not installed. Install it with: pip install qdrant-client")
+        
+        if settings.qdrant_api_key:
+            return AsyncQdrantClient(
+                url=f"https://{settings.qdrant_host}",
+                api_key=settings.qdrant_api_key,
+            )
+        return AsyncQdrantClient(
+            host=settings.qdrant_host,
+            port=settings.qdrant_port,
+        )
+    
     def create_collection(
         self,
         collection_name: str,
         vector_size: int = 384,  # all-MiniLM-L6-v2 dimension
-        distance = None
+        distance = None,
+        quantize: bool = True
     ) -> bool:
-        """Create a Qdrant collection if it doesn't exist."""
+        """Create a Qdrant collection if it doesn't exist.
+        
+        With `quantize`, Qdrant keeps an INT8 scalar-quantized copy of the
+        vectors in RAM for search (4x smaller than float32), rescoring the top
+        candidates against the original vectors.
+        """
         if not QDRANT_AVAILABLE:
             raise ImportError("qdrant_client package is not installed")
         
@@ -91,15 +136,28 @@ class QdrantManager:
             collection_names = [c.name for c in collections]
             
             if collection_name in collection_names:
-                logger.info(f"Collection {collection_name} already exists")
+                logger.debug(f"Collection {collection_name} already exists")
                 return True
             
+            quantization_config = None
+            if quantize:
+                from qdrant_client.models import ScalarQuantization, ScalarQuantizationConfig, ScalarType
+                
+                quantization_config = ScalarQuantization(
+                    scalar=ScalarQuantizationConfig(
+                        type=ScalarType.INT8,
+                        quantile=0.99,
+                        always_ram=True,
+                    )
+                )
+            
             self.client.create_collection(
                 collection_name=collection_name,
                 vectors_config=VectorParams(
                     size=vector_size,
                     distance=distance,
                 ),
+                quantization_config=quantization_config,
             )
             logger.info(f"Created collection: {collection_name}")
             return True
@@ -110,20 +168,146 @@ class QdrantManager:
     def upsert_points(
         self,
         collection_name: str,
-        points: List[Any]
+        points: List[Any],
+        batch_size: Optional[int] = None
     ) -> bool:
-        """Insert or update points in a collection."""
+        """Insert or update points in a collection.
+        
+        If `batch_size` is given, points are sent in requests of at most that size.
+        """
         try:
-            self.client.upsert(
+            step = batch_size or len(points) or 1
+            for i in range(0, len(points), step):
+                self.client.upsert(
+                    collection_name=collection_name,
+                    points=points[i:i + step]
+                )
+            logger.debug(f"Upserted {len(points)} points to {collection_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Error upserting points to {collection_name}: {e}")
+            return False
+
+    async def aupsert_points(
+        self,
+        collection_name: str,
+        points: List[Any],
+        batch_size: int = 256,
+        concurrency: int = 8
+    ) -> bool:
+        """Upsert points in batches concurrently over the async client.
+        
+        At most `concurrency` upsert requests are in flight at once.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        aclient = self._make_async_client()
+        
+        async def upsert_batch(batch: List[Any]) -> None:
+            async with semaphore:
+                await aclient.upsert(collection_name=collection_name, points=batch)
+        
+        try:
+            results = await asyncio.gather(
+                *(upsert_batch(points[i:i + batch_size]) for i in range(0, len(points), batch_size)),
+                return_exceptions=True
+            )
+        finally:
+            await aclient.close()
+        errors = [r for r in results if isinstance(r, Exception)]
+        for e in errors:
+            logger.error(f"Error upserting batch to {collection_name}: {e}")
+        if errors:
+            return False
+        logger.debug(f"Upserted {len(points)} points to {collection_name}")
+        return True
+    
+    def upload_points(
+        self,
+        collection_name: str,
+        points: List[Any],
+        parallel: int = 8,
+        batch_size: int = 256
+    ) -> bool:
+        """Bulk-load points with the client's batching uploader.
+
+        Worker processes are only spawned when there is more than one batch
+        to send, so small uploads stay in-process. Returns once Qdrant has
+        applied the writes.
+        """
+        if not points:
+            return True
+        try:
+            num_batches = -(-len(points) // batch_size)
+            self.client.upload_points(
                 collection_name=collection_name,
-                points=points
+                points=points,
+                batch_size=batch_size,
+                parallel=max(1, min(parallel, num_batches)),
+                max_retries=3,
+                wait=True
             )
-            logger.info(f"Upserted {len(points)} points to {collection_name}")
+            logger.debug(f"Uploaded {len(points)} points to {collection_name}")
             return True
         except Exception as e:
-            logger.error(f"Error upserting points to {collection_name}: {e}")
+            logger.error(f"Error uploading points to {collection_name}: {e}")
+            return False
+
+    def set_indexing_threshold(self, collection_name: str, indexing_threshold: int) -> bool:
+        """Update a collection's HNSW indexing threshold (0 disables indexing)."""
+        try:
+            from qdrant_client.models import OptimizersConfigDiff
+            
+            self.client.update_collection(
+                collection_name=collection_name,
+                optimizers_config=OptimizersConfigDiff(indexing_threshold=indexing_threshold)
+            )
+            return True
+        except Exception as e:
+            logger.warning(f"Could not set indexing threshold on {collection_name}: {e}")
             return False
     
+    @contextmanager
+    def bulk_load(
+        self,
+        collection_names: Iterable[str],
+        indexing_threshold: int = 20000
+    ) -> Iterator[None]:
+        """Pause HNSW indexing on collections for the duration of a bulk upload.
+        
+        Qdrant otherwise rebuilds the index continuously while points
+        arrive; with indexing disabled it builds it once when the threshold
+        is restored on exit (even if the upload raised).
+        """
+        paused = [
+            name for name in collection_names
+            if self.set_indexing_threshold(name, 0)
+        ]
+        try:
+            yield
+        finally:
+            for name in paused:
+                self.set_indexing_threshold(name, indexing_threshold)
+    
+    def get_existing_ids(
+        self,
+        collection_name: str,
+        ids: List[Any]
+    ) -> Set[str]:
+        """Return the subset of `ids` already stored in a collection (as strings)."""
+        if not ids:
+            return set()
+        try:
+            records = self.client.retrieve(
+                collection_name=collection_name,
+                ids=ids,
+                with_payload=False,
+                with_vectors=False
+            )
+            return {str(r.id) for r in records}
+        except Exception as e:
+            logger.warning(f"Could not look up existing points in {collection_name}: {e}")
+            return set()
+    
     def search(
         self,
         collection_name: str,
@@ -134,24 +318,12 @@ class QdrantManager:
     ) -> List[Dict[str, Any]]:
         """Search for similar vectors in a collection."""
         try:
-            from qdrant_client.models import Filter, FieldCondition, MatchValue
-            
-            query_filter = None
-            if filter_dict:
-                conditions = []
-                for key, value in filter_dict.items():
-                    conditions.append(
-                        FieldCondition(key=key, match=MatchValue(value=value))
-                    )
-                if conditions:
-                    query_filter = Filter(must=conditions)
-            
             results = self.client.query_points(
                 collection_name=collection_name,
                 query=query_vector,
                 limit=limit,
                 score_threshold=score_threshold,
-                query_filter=query_filter
+                query_filter=self._build_filter(filter_dict)
             )
             
             return [
@@ -166,6 +338,67 @@ class QdrantManager:
             logger.error(f"Error searching {collection_name}: {e}")
             return []
     
+    def search_batch(
+        self,
+        collection_name: str,
+        query_vectors: List[List[float]],
+        limit: int = 5,
+        score_threshold: float = 0.5,
+        filter_dicts: Optional[List[Optional[Dict[str, Any]]]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Run several searches against a collection in a single request.
+        
+        `query_vectors` may be a list of vectors or a 2-D numpy array.
+        Returns one result list per query vector, in the same order.
+        """
+        if len(query_vectors) == 0:
+            return []
+        if filter_dicts is None:
+            filter_dicts = [None] * len(query_vectors)
+        try:
+            from qdrant_client.models import QueryRequest
+            
+            responses = self.client.query_batch_points(
+                collection_name=collection_name,
+                requests=[
+                    QueryRequest(
+                        query=query_vector,
+                        limit=limit,
+                        score_threshold=score_threshold,
+                        filter=self._build_filter(filter_dict),
+                        with_payload=True
+                    )
+                    for query_vector, filter_dict in zip(query_vectors, filter_dicts)
+                ]
+            )
+            
+            return [
+                [
+                    {
+                        "id": hit.id,
+                        "score": hit.score,
+                        "payload": hit.payload
+                    }
+                    for hit in response.points
+                ]
+                for response in responses
+            ]
+        except Exception as e:
+            logger.error(f"Error batch searching {collection_name}: {e}")
+            return [[] for _ in query_vectors]
+    
+    @staticmethod
+    def _build_filter(filter_dict: Optional[Dict[str, Any]]):
+        """Build a Qdrant `must` filter from exact-match key/value pairs."""
+        if not filter_dict:
+            return None
+        from qdrant_client.models import Filter, FieldCondition, MatchValue
+        
+        return Filter(must=[
+            FieldCondition(key=key, match=MatchValue(value=value))
+            for key, value in filter_dict.items()
+        ])
+    
     def get_collection_info(self, collection_name: str) -> Optional[Dict[str, Any]]:
         """Get information about a collection."""
         try:
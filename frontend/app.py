@@ -1,7 +1,6 @@
 """Streamlit frontend for NyayaAI - SIMPLIFIED."""
 import streamlit as st
-import requests
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List
 
 # Page config
 st.set_page_config(
@@ -14,20 +13,119 @@ st.set_page_config(
 API_URL = "http://localhost:8000"
 
 
+@st.cache_resource
+def get_session():
+    """Shared HTTP session (keep-alive across reruns), created on first query.
+    
+    `requests` is imported here rather than at module top so widget-only
+    reruns don't pay for it. The adapter keeps a small connection pool for
+    concurrent Streamlit sessions and retries with backoff while the API is
+    unreachable (e.g. still starting or reloading). The query POSTs are
+    retried on 502/503/504 too: a query has no side effects beyond being
+    answered twice.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    retry = Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=frozenset({"GET", "POST"}),
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
 def process_query_simple(query: str, user_id: str = "anonymous") -> Dict[str, Any]:
-    """Call the SIMPLE API endpoint (ONE LLM call)."""
+    """Call the SIMPLE API endpoint (ONE LLM call).
+    
+    Fallback for main() when the stream endpoint fails before any token.
+    """
+    import orjson
+    
     try:
-        response = requests.post(
+        response = get_session().post(
             f"{API_URL}/api/v1/query/simple",
-            json={"query": query, "user_id": user_id},
+            data=orjson.dumps({"query": query, "user_id": user_id}),
+            headers={"Content-Type": "application/json"},
             timeout=60
         )
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     except Exception as e:
         return {"error": str(e)}
 
 
+def process_query_stream(query: str, user_id: str = "anonymous") -> Iterator[Dict[str, Any]]:
+    """Call the STREAM API endpoint and yield its Server-Sent Events.
+    
+    Yields {"event": "token", "data": str} while the answer is generated,
+    then {"event": "result", "data": dict}. Errors are yielded as a result
+    event carrying an "error" key.
+    """
+    import orjson
+    
+    try:
+        with get_session().post(
+            f"{API_URL}/api/v1/query/stream",
+            data=orjson.dumps({"query": query, "user_id": user_id}),
+            # Opt out of gzip so SSE events are not buffered by the compressor
+            headers={"Content-Type": "application/json", "Accept-Encoding": "identity"},
+            stream=True,
+            timeout=60
+        ) as response:
+            response.raise_for_status()
+            event = "message"
+            for line in response.iter_lines():
+                if line.startswith(b"event:"):
+                    event = line[len(b"event:"):].strip().decode()
+                elif line.startswith(b"data:"):
+                    yield {"event": event, "data": orjson.loads(line[len(b"data:"):])}
+    except Exception as e:
+        yield {"event": "result", "data": {"error": str(e)}}
+
+
+@st.fragment
+def render_sidebar():
+    """Static About/Disclaimer block.
+    
+    Runs as a fragment so it is isolated from reruns scoped to other
+    fragments; call it inside `with st.sidebar:`.
+    """
+    st.header("About")
+    st.markdown("""
+    NyayaAI helps you:
+    - Understand laws and rights
+    - Navigate civic processes
+    - Get helpful information
+    
+    **Powered by:**
+    - 📚 Qdrant (Legal Database)
+    - 🌐 Tavily (Web Search)
+    - 🤖 Groq LLM
+    """)
+    
+    st.markdown("---")
+    st.warning("""
+    **⚠️ Disclaimer**
+    
+    This provides legal **information** only, 
+    NOT legal advice. Consult a qualified 
+    lawyer for specific legal matters.
+    """)
+
+
+@st.fragment
+def render_last_result(result: Dict[str, Any]):
+    """Re-display the previous answer from session state without re-querying."""
+    display_simple_result(result)
+
+
 def main():
     """Main Streamlit app."""
     st.title("⚖️ NyayaAI")
@@ -36,27 +134,7 @@ def main():
     
     # Sidebar
     with st.sidebar:
-        st.header("About")
-        st.markdown("""
-        NyayaAI helps you:
-        - Understand laws and rights
-        - Navigate civic processes
-        - Get helpful information
-        
-        **Powered by:**
-        - 📚 Qdrant (Legal Database)
-        - 🌐 Tavily (Web Search)
-        - 🤖 Groq LLM
-        """)
-        
-        st.markdown("---")
-        st.warning("""
-        **⚠️ Disclaimer**
-        
-        This provides legal **information** only, 
-        NOT legal advice. Consult a qualified 
-        lawyer for specific legal matters.
-        """)
+        render_sidebar()
     
     # Query input
     query = st.text_area(
@@ -69,15 +147,39 @@ def main():
         if not query.strip():
             st.error("Please enter a question")
         else:
-            with st.spinner("Finding information..."):
+            st.markdown("---")
+            placeholder = st.empty()
+            placeholder.caption("Finding information...")
+            
+            buf = ""
+            result: Dict[str, Any] = {}
+            for event in process_query_stream(query):
+                if event["event"] == "token":
+                    buf += event["data"]
+                    placeholder.markdown(buf)
+                elif event["event"] == "result":
+                    result = event["data"]
+            
+            if result.get('error'):
+                # Stream unavailable or cut off mid-answer; discard any partial
+                # text and retry once without streaming
+                placeholder.caption("Retrying...")
                 result = process_query_simple(query)
             
             if result.get('error'):
+                placeholder.empty()
                 st.error(f"Error: {result['error']}")
             elif result.get('response'):
-                display_simple_result(result)
+                placeholder.markdown(result['response'])
+                display_sources(result)
+                st.session_state["last_result"] = result
             else:
+                placeholder.empty()
                 st.warning("No response received. Please try again.")
+    elif st.session_state.get("last_result"):
+        # Other widget interactions rerun the script; keep showing the last
+        # answer instead of dropping it or calling the API again.
+        render_last_result(st.session_state["last_result"])
 
 
 def display_simple_result(result: Dict[str, Any]):
@@ -89,6 +191,28 @@ def display_simple_result(result: Dict[str, Any]):
     if response:
         st.markdown(response)
     
+    display_sources(result)
+
+
+def render_sources(retrieved_docs: List[Dict[str, Any]], web_results: List[Dict[str, Any]]) -> str:
+    """Format retrieved docs and web results as a single markdown block."""
+    sections = []
+    if retrieved_docs:
+        sections.append("**From Database:**\n" + "\n".join(
+            f"- **[{doc.get('type', 'doc').upper()}]** {doc.get('title', 'Document')} _{doc.get('source', '')}_"
+            for doc in retrieved_docs
+        ))
+    if web_results:
+        sections.append("**From Web:**\n" + "\n".join(
+            f"- [{web.get('title', 'Web Source')}]({web['url']})" if web.get('url')
+            else f"- {web.get('title', 'Web Source')}"
+            for web in web_results
+        ))
+    return "\n\n".join(sections)
+
+
+def display_sources(result: Dict[str, Any]):
+    """Display source metrics, retrieved sources and case ID for a result."""
     # Sources summary
     sources = result.get('sources', {})
     if sources:
@@ -109,23 +233,7 @@ def display_simple_result(result: Dict[str, Any]):
     
     if retrieved_docs or web_results:
         with st.expander("📖 View Sources", expanded=False):
-            if retrieved_docs:
-                st.markdown("**From Database:**")
-                for doc in retrieved_docs[:3]:
-                    doc_type = doc.get('type', 'doc').upper()
-                    title = doc.get('title', 'Document')
-                    source = doc.get('source', '')
-                    st.markdown(f"- **[{doc_type}]** {title} _{source}_")
-            
-            if web_results:
-                st.markdown("**From Web:**")
-                for web in web_results[:3]:
-                    title = web.get('title', 'Web Source')
-                    url = web.get('url', '')
-                    if url:
-                        st.markdown(f"- [{title}]({url})")
-                    else:
-                        st.markdown(f"- {title}")
+            st.markdown(render_sources(retrieved_docs[:3], web_results[:3]))
     
     # Case ID footer
     if result.get('case_id'):
@@ -5,14 +5,14 @@ import logging
 logger = logging.getLogger(__name__)
 
 try:
-    from llm.groq_client import groq_llm, GroqLLM
-    __all__ = ["groq_llm", "GroqLLM", "logger"]
-except (ImportError, ValueError) as e:
-    # Fallback if groq_client can't be imported or initialized
+    # GroqLLM is created lazily by get_groq_llm(), so importing is cheap
+    from llm.groq_client import get_groq_llm, GroqLLM
+except ImportError as e:
+    # Fallback if groq_client can't be imported
     logger.warning(f"LLM module initialization warning: {e}")
-    groq_llm = None
-    try:
-        from llm.groq_client import GroqLLM
-    except ImportError:
-        GroqLLM = None
-    __all__ = ["groq_llm", "GroqLLM", "logger"]
+    GroqLLM = None
+
+    def get_groq_llm():
+        return None
+
+__all__ = ["get_groq_llm", "GroqLLM", "logger"]
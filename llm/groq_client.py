@@ -1,15 +1,39 @@
 """Groq LLM Client - Synthesis Agent for Legal Information."""
+import asyncio
 import logging
-from typing import Optional, List, Dict, Any
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Iterator
 from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
 try:
     # Optional dependency: the app should still run (with fallbacks) if Groq isn't installed.
-    from groq import Groq  # type: ignore
+    from groq import AsyncGroq, Groq  # type: ignore
 except ImportError:  # pragma: no cover
     Groq = None  # type: ignore
+    AsyncGroq = None  # type: ignore
+
+# Single source of truth for the Groq model (mixtral-8x7b has been decommissioned)
+_MODEL = "llama-3.1-8b-instant"
+
+# Upper bound on concurrent async Groq requests per GroqLLM (rate-limit headroom)
+MAX_CONCURRENT_REQUESTS = 8
+
+# Section headers of the synthesis prompt -> keys of the parsed result
+_SECTION_KEYS = {
+    "PLAIN LANGUAGE EXPLANATION": "plain_language_explanation",
+    "WHAT THE LAW GENERALLY SAYS": "what_law_says",
+    "RETRIEVED EVIDENCE": "retrieved_evidence",
+    "SIMILAR CASE EXAMPLES": "similar_cases",
+    "WEB SOURCES": "web_sources",
+    "WHAT YOU CAN CONSIDER": "what_you_can_consider",
+    "DISCLAIMER": "disclaimer",
+}
+_SECTION_RE = re.compile(r"\[(" + "|".join(map(re.escape, _SECTION_KEYS)) + r")\]")
 
 
 class GroqLLM:
@@ -27,7 +51,11 @@ class GroqLLM:
             raise ValueError("GROQ_API_KEY not set in environment variables")
         
         self.client = Groq(api_key=self.api_key)
-        self.model = "llama-3.1-8b-instant"
+        self.model = _MODEL
+        
+        # Event loop -> (AsyncGroq client, semaphore), managed by _async_state()
+        self._async_states = {}
+        self._async_lock = threading.Lock()
         
         # Enhanced synthesis-focused system prompt
         self.system_prompt = """You are a LEGAL & CIVIC INFORMATION ASSISTANT.
@@ -55,6 +83,30 @@ You must NEVER:
 - Invent case law or statutes
 - Pretend retrieved data exists when it does not
 - Expose internal chain-of-thought"""
+        # Invariant system message shared by every request; never mutated
+        self._system_msg = {"role": "system", "content": self.system_prompt}
+        
+        if settings.groq_startup_check:
+            self.self_test()
+
+    def self_test(self) -> bool:
+        """Issue a 1-token request and log the model and round-trip latency.
+        
+        Surfaces a bad key or retired model at startup instead of on the
+        first user query.
+        """
+        start = time.perf_counter()
+        try:
+            self.client.chat.completions.create(
+                messages=[{"role": "user", "content": "ping"}],
+                model=self.model,
+                max_tokens=1,
+            )
+        except Exception as e:
+            logger.error(f"Groq self-test failed for model {self.model}: {e}")
+            return False
+        logger.info(f"Groq self-test OK: {self.model} in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return True
 
     def synthesize_legal_answer(
         self,
@@ -81,15 +133,86 @@ You must NEVER:
             Dict with summary, reasoning steps, confidence level
         """
         try:
-            # Build evidence context
-            evidence_context = self._build_evidence_context(
-                retrieved_statutes or [],
-                similar_cases or [],
-                web_search_results or []
+            prompt = self._build_synthesis_prompt(
+                query, retrieved_statutes, similar_cases, web_search_results
+            )
+            
+            response = self.client.chat.completions.create(
+                messages=self._messages(prompt),
+                model=self.model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                top_p=1.0,
             )
             
-            # Construct synthesis prompt
-            prompt = f"""
+            result_text = response.choices[0].message.content.strip()
+            
+            # Parse the structured response
+            return self._parse_synthesis_response(result_text)
+        
+        except Exception as e:
+            logger.error(f"Error in synthesis: {e}")
+            return self._synthesis_error(e)
+
+    async def asynthesize_legal_answer(
+        self,
+        query: str,
+        retrieved_statutes: List[Dict[str, str]] = None,
+        similar_cases: List[Dict[str, str]] = None,
+        web_search_results: List[Dict[str, str]] = None,
+        temperature: float = 0.3,
+        max_tokens: int = 2000
+    ) -> Dict[str, Any]:
+        """Async variant of synthesize_legal_answer().
+        
+        Lets callers run several syntheses concurrently, e.g.
+        `await asyncio.gather(*(llm.asynthesize_legal_answer(q) for q in queries))`;
+        at most MAX_CONCURRENT_REQUESTS are in flight at once.
+        """
+        try:
+            prompt = self._build_synthesis_prompt(
+                query, retrieved_statutes, similar_cases, web_search_results
+            )
+            response = await self._acreate(self._messages(prompt), temperature, max_tokens)
+            result_text = response.choices[0].message.content.strip()
+            return self._parse_synthesis_response(result_text)
+        
+        except Exception as e:
+            logger.error(f"Error in synthesis: {e}")
+            return self._synthesis_error(e)
+
+    async def synthesize_batch(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run several independent syntheses concurrently over one async client.
+
+        Args:
+            requests: Keyword arguments for asynthesize_legal_answer(), one dict per synthesis
+
+        Returns:
+            Parsed synthesis results, in the same order as `requests`
+
+        Example:
+            `results = asyncio.run(llm.synthesize_batch([{"query": q} for q in queries]))`
+        """
+        # _acreate() already caps in-flight requests at MAX_CONCURRENT_REQUESTS
+        return list(await asyncio.gather(
+            *(self.asynthesize_legal_answer(**request) for request in requests)
+        ))
+
+    def _build_synthesis_prompt(
+        self,
+        query: str,
+        retrieved_statutes: Optional[List[Dict[str, str]]],
+        similar_cases: Optional[List[Dict[str, str]]],
+        web_search_results: Optional[List[Dict[str, str]]]
+    ) -> str:
+        """Build the synthesis prompt from the query and evidence."""
+        evidence_context = self._build_evidence_context(
+            retrieved_statutes or [],
+            similar_cases or [],
+            web_search_results or []
+        )
+        
+        prompt = f"""
 User Query: {query}
 
 Available Information:
@@ -121,32 +244,59 @@ Non-advisory civic guidance about what people typically do
 Clear statement that this is not legal advice
 
 Be helpful, clear, and comprehensive. Never say "no information found" - always provide general explanation."""
-            
-            response = self.client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
+        return prompt
+
+    def _messages(self, prompt: str) -> List[Dict[str, str]]:
+        """Chat messages for a single-turn request."""
+        return [self._system_msg, {"role": "user", "content": prompt}]
+
+    @staticmethod
+    def _synthesis_error(error: Exception) -> Dict[str, Any]:
+        """Fallback synthesis result returned when the API call fails."""
+        return {
+            "summary": "Unable to generate synthesis at this time.",
+            "confidence_level": "low",
+            "reasoning_steps": [],
+            "limitations": "API error occurred",
+            "error": str(error)
+        }
+
+    async def _async_state(self):
+        """Get the AsyncGroq client and request semaphore for the running loop.
+        
+        Both bind to the event loop they are first used on, so each loop gets
+        its own pair. Pairs of loops that have since closed (e.g. earlier
+        asyncio.run() calls) are dropped and their clients closed.
+        """
+        loop = asyncio.get_running_loop()
+        stale = []
+        with self._async_lock:
+            state = self._async_states.get(loop)
+            if state is None:
+                if AsyncGroq is None:
+                    raise ImportError("Optional dependency 'groq' is not installed.")
+                for other in [l for l in self._async_states if l.is_closed()]:
+                    stale.append(self._async_states.pop(other)[0])
+                state = (AsyncGroq(api_key=self.api_key), asyncio.Semaphore(MAX_CONCURRENT_REQUESTS))
+                self._async_states[loop] = state
+        for aclient in stale:
+            try:
+                await aclient.close()
+            except Exception as e:  # its connections belong to a closed loop
+                logger.debug(f"Error closing stale AsyncGroq client: {e}")
+        return state
+
+    async def _acreate(self, messages: List[Dict[str, str]], temperature: float, max_tokens: int):
+        """Await a chat completion, bounded by the per-loop semaphore."""
+        aclient, semaphore = await self._async_state()
+        async with semaphore:
+            return await aclient.chat.completions.create(
+                messages=messages,
                 model=self.model,
                 temperature=temperature,
                 max_tokens=max_tokens,
                 top_p=1.0,
             )
-            
-            result_text = response.choices[0].message.content.strip()
-            
-            # Parse the structured response
-            return self._parse_synthesis_response(result_text)
-        
-        except Exception as e:
-            logger.error(f"Error in synthesis: {e}")
-            return {
-                "summary": "Unable to generate synthesis at this time.",
-                "confidence_level": "low",
-                "reasoning_steps": [],
-                "limitations": "API error occurred",
-                "error": str(e)
-            }
 
     def _build_evidence_context(
         self,
@@ -154,32 +304,58 @@ Be helpful, clear, and comprehensive. Never say "no information found" - always
         cases: List[Dict[str, str]],
         web_results: List[Dict[str, str]] = None
     ) -> str:
-        """Build formatted evidence context for LLM."""
-        context = ""
+        """Build formatted evidence context for LLM.
+
+        Only the (truncated) fields that end up in the prompt are pulled into
+        hashable keys, so repeated evidence sets hit the formatting cache.
+        Fields are stringified first since payload values may be lists/dicts.
+        """
+        statutes_key = tuple(
+            (
+                str(statute.get("title", "Unknown")),
+                str(statute.get("summary") or statute.get("content") or "No summary")[:300],
+            )
+            for statute in (statutes or [])[:5]  # Limit to top 5
+        )
+        cases_key = tuple(
+            (
+                str(case.get("case_name", "Unknown")),
+                str(case.get("outcome") or case.get("summary") or "No details")[:200],
+            )
+            for case in (cases or [])[:5]  # Limit to top 5
+        )
+        web_key = tuple(
+            (
+                str(result.get("title", "Unknown")),
+                str(result.get("url", "")),
+                str(result.get("content") or "No content")[:200],
+            )
+            for result in (web_results or [])[:3]  # Limit to top 3
+        )
+        return self._build_evidence_context_cached(statutes_key, cases_key, web_key)
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _build_evidence_context_cached(statutes_key: tuple, cases_key: tuple, web_key: tuple) -> str:
+        """Format evidence keys built by _build_evidence_context()."""
+        parts: List[str] = []
         
-        if statutes:
-            context += "RELEVANT STATUTES & ACTS:\n"
-            for i, statute in enumerate(statutes[:5], 1):  # Limit to top 5
-                title = statute.get("title", "Unknown")
-                summary = statute.get("summary", statute.get("content", "No summary"))
-                context += f"{i}. {title}\n   {summary[:300]}...\n\n"
+        if statutes_key:
+            parts.append("RELEVANT STATUTES & ACTS:\n")
+            for i, (title, summary) in enumerate(statutes_key, 1):
+                parts.append(f"{i}. {title}\n   {summary}...\n\n")
         
-        if cases:
-            context += "\nSIMILAR CASES:\n"
-            for i, case in enumerate(cases[:5], 1):  # Limit to top 5
-                name = case.get("case_name", "Unknown")
-                outcome = case.get("outcome", case.get("summary", "No details"))
-                context += f"{i}. {name}\n   Outcome: {outcome[:200]}...\n\n"
+        if cases_key:
+            parts.append("\nSIMILAR CASES:\n")
+            for i, (name, outcome) in enumerate(cases_key, 1):
+                parts.append(f"{i}. {name}\n   Outcome: {outcome}...\n\n")
         
-        if web_results:
-            context += "\nWEB SEARCH RESULTS:\n"
-            for i, result in enumerate(web_results[:3], 1):  # Limit to top 3
-                title = result.get("title", "Unknown")
-                url = result.get("url", "")
-                content = result.get("content", "No content")[:200]
-                context += f"{i}. {title}\n   URL: {url}\n   {content}...\n\n"
+        if web_key:
+            parts.append("\nWEB SEARCH RESULTS:\n")
+            for i, (title, url, content) in enumerate(web_key, 1):
+                parts.append(f"{i}. {title}\n   URL: {url}\n   {content}...\n\n")
         
-        return context if context else "No specific evidence provided."
+        return "".join(parts) if parts else "No specific evidence provided."
 
     def _parse_synthesis_response(self, response_text: str) -> Dict[str, Any]:
         """Parse LLM synthesis response into structured format."""
@@ -195,75 +371,31 @@ Be helpful, clear, and comprehensive. Never say "no information found" - always
                 "full_response": response_text
             }
             
-            # Parse sections
-            if "[PLAIN LANGUAGE EXPLANATION]" in response_text:
-                part = response_text.split("[PLAIN LANGUAGE EXPLANATION]")[1]
-                if "[" in part:
-                    sections["plain_language_explanation"] = part.split("[")[0].strip()
-                else:
-                    sections["plain_language_explanation"] = part.strip()
-            
-            if "[WHAT THE LAW GENERALLY SAYS]" in response_text:
-                part = response_text.split("[WHAT THE LAW GENERALLY SAYS]")[1]
-                if "[" in part:
-                    sections["what_law_says"] = part.split("[")[0].strip()
-                else:
-                    sections["what_law_says"] = part.strip()
+            # Parse sections in one pass: each section runs from its header to
+            # the next header (or the end). The first occurrence of a header wins.
+            matches = list(_SECTION_RE.finditer(response_text))
+            seen = set()
+            for i, match in enumerate(matches):
+                header = match.group(1)
+                if header in seen:
+                    continue
+                seen.add(header)
+                end = matches[i + 1].start() if i + 1 < len(matches) else len(response_text)
+                sections[_SECTION_KEYS[header]] = response_text[match.end():end].strip()
             
-            if "[RETRIEVED EVIDENCE]" in response_text:
-                part = response_text.split("[RETRIEVED EVIDENCE]")[1]
-                if "[" in part:
-                    sections["retrieved_evidence"] = part.split("[")[0].strip()
-                else:
-                    sections["retrieved_evidence"] = part.strip()
-            
-            if "[SIMILAR CASE EXAMPLES]" in response_text:
-                part = response_text.split("[SIMILAR CASE EXAMPLES]")[1]
-                if "[" in part:
-                    sections["similar_cases"] = part.split("[")[0].strip()
-                else:
-                    sections["similar_cases"] = part.strip()
-            
-            if "[WEB SOURCES]" in response_text:
-                part = response_text.split("[WEB SOURCES]")[1]
-                if "[" in part:
-                    sections["web_sources"] = part.split("[")[0].strip()
-                else:
-                    sections["web_sources"] = part.strip()
-            
-            if "[WHAT YOU CAN CONSIDER]" in response_text:
-                part = response_text.split("[WHAT YOU CAN CONSIDER]")[1]
-                if "[" in part:
-                    sections["what_you_can_consider"] = part.split("[")[0].strip()
-                else:
-                    sections["what_you_can_consider"] = part.strip()
-            
-            if "[DISCLAIMER]" in response_text:
-                sections["disclaimer"] = response_text.split("[DISCLAIMER]")[1].strip()
-            
-            # Determine confidence based on content
-            confidence = "medium"
+            # Determine confidence based on content; the response is lowercased
+            # (once) only when the hedging-word check is actually needed.
             if sections["retrieved_evidence"] or sections["similar_cases"] or sections["web_sources"]:
                 confidence = "high"
             elif sections["what_law_says"]:
-                confidence = "medium"
+                lowered = response_text.lower()
+                confidence = "low" if ("unclear" in lowered or "unknown" in lowered) else "medium"
             else:
                 confidence = "low"
             
             sections["confidence_level"] = confidence
             
             return sections
-            
-            # Determine confidence based on evidence coverage
-            confidence = "medium"
-            if len(sections["reasoning_steps"]) > 3:
-                confidence = "high"
-            elif "unclear" in response_text.lower() or "unknown" in response_text.lower():
-                confidence = "low"
-            
-            sections["confidence_level"] = confidence
-            
-            return sections
         
         except Exception as e:
             logger.error(f"Error parsing synthesis response: {e}")
@@ -287,32 +419,108 @@ Be helpful, clear, and comprehensive. Never say "no information found" - always
         """
         try:
             response = self.client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=self._messages(prompt),
                 model=self.model,
                 temperature=temperature,
                 max_tokens=max_tokens,
                 top_p=1.0,
             )
             
-            result = response.choices[0].message.content
-            if not result or not result.strip():
+            raw = response.choices[0].message.content
+            result = raw.strip() if raw else ""
+            if not result:
+                logger.warning("Groq returned empty response")
+                return "Unable to generate a response at this time."
+            
+            return result
+        
+        except Exception as e:
+            logger.error(f"Error calling Groq API: {e}")
+            logger.warning("Using fallback response due to API error")
+            return "Based on the provided legal documents, here is relevant information about your query."
+
+    async def agenerate_response(
+        self,
+        prompt: str,
+        temperature: float = 0.2,
+        max_tokens: int = 1500
+    ) -> str:
+        """Async variant of generate_response()."""
+        try:
+            response = await self._acreate(self._messages(prompt), temperature, max_tokens)
+            
+            raw = response.choices[0].message.content
+            result = raw.strip() if raw else ""
+            if not result:
                 logger.warning("Groq returned empty response")
                 return "Unable to generate a response at this time."
             
-            return result.strip()
+            return result
         
         except Exception as e:
             logger.error(f"Error calling Groq API: {e}")
             logger.warning("Using fallback response due to API error")
             return "Based on the provided legal documents, here is relevant information about your query."
 
+    def stream_response(
+        self,
+        prompt: str,
+        temperature: float = 0.2,
+        max_tokens: int = 1500
+    ) -> Iterator[str]:
+        """Streaming variant of generate_response().
 
-# Global Groq LLM instance
-try:
-    groq_llm = GroqLLM()
-except (ValueError, ImportError) as e:
-    logger.warning(f"Groq LLM unavailable; running in fallback mode: {e}")
-    groq_llm = None
+        Yields response text incrementally as Groq produces tokens. The
+        fallback sentence is only yielded if the API fails before any token
+        was emitted; a failure mid-stream is re-raised so callers don't treat
+        a truncated answer as complete.
+        """
+        emitted = False
+        try:
+            stream = self.client.chat.completions.create(
+                messages=self._messages(prompt),
+                model=self.model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                top_p=1.0,
+                stream=True,
+            )
+
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    emitted = True
+                    yield delta
+
+        except Exception as e:
+            logger.error(f"Error streaming from Groq API: {e}")
+            if emitted:
+                raise
+            logger.warning("Using fallback response due to API error")
+            yield "Based on the provided legal documents, here is relevant information about your query."
+
+
+# Shared Groq LLM instance, created on first use rather than at import time
+_groq_llm: Optional[GroqLLM] = None
+_groq_llm_initialized = False
+_groq_llm_lock = threading.Lock()
+
+
+def get_groq_llm() -> Optional[GroqLLM]:
+    """Return the shared GroqLLM, creating it on the first call.
+
+    Returns:
+        The GroqLLM instance, or None if Groq is unavailable (missing package
+        or API key), in which case callers use their fallback paths.
+    """
+    global _groq_llm, _groq_llm_initialized
+    if not _groq_llm_initialized:
+        with _groq_llm_lock:
+            if not _groq_llm_initialized:
+                try:
+                    _groq_llm = GroqLLM()
+                except (ValueError, ImportError) as e:
+                    logger.warning(f"Groq LLM unavailable; running in fallback mode: {e}")
+                    _groq_llm = None
+                _groq_llm_initialized = True
+    return _groq_llm
@@ -2,11 +2,18 @@
 import uvicorn
 from config.settings import settings
 
+# Source packages watched by the dev reloader (keeps data/, docs/ and logs out of the scan)
+RELOAD_DIRS = ["api", "agents", "core", "llm", "config", "database", "utils"]
+RELOAD_EXCLUDES = ["*.log", "*.pyc", "data/*", "__pycache__/*"]
+
 if __name__ == "__main__":
     # Use import string for reload mode (required by uvicorn)
     uvicorn.run(
         "api.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=settings.debug
+        reload=settings.debug,
+        reload_dirs=RELOAD_DIRS if settings.debug else None,
+        reload_excludes=RELOAD_EXCLUDES if settings.debug else None,
+        workers=1
     )
@@ -30,10 +30,39 @@ fi
 # Check dependencies
 echo ""
 echo "3. Checking key dependencies..."
-python3 -c "import streamlit" 2>/dev/null && echo "   ✓ streamlit" || echo "   ✗ streamlit (install: pip install streamlit)"
-python3 -c "import fastapi" 2>/dev/null && echo "   ✓ fastapi" || echo "   ✗ fastapi (install: pip install fastapi uvicorn)"
-python3 -c "import qdrant_client" 2>/dev/null && echo "   ✓ qdrant_client" || echo "   ✗ qdrant_client (install: pip install qdrant-client)"
-python3 -c "import groq" 2>/dev/null && echo "   ✓ groq" || echo "   ⚠ groq (optional, install: pip install groq)"
+# One interpreter imports the independent packages concurrently; results print in order
+python3 - <<'PY'
+import contextlib
+import importlib
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+checks = [
+    ("streamlit", "✗", "install: pip install streamlit"),
+    ("fastapi", "✗", "install: pip install fastapi uvicorn"),
+    ("qdrant_client", "✗", "install: pip install qdrant-client"),
+    ("groq", "⚠", "optional, install: pip install groq"),
+]
+
+def check(name):
+    try:
+        importlib.import_module(name)
+        return True
+    except Exception:
+        return False
+
+# Only the package imports are silenced (they log warnings on stderr);
+# errors in this script itself stay visible
+with contextlib.redirect_stderr(io.StringIO()):
+    with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        found = list(executor.map(check, [name for name, _, _ in checks]))
+
+for (name, mark, hint), ok in zip(checks, found):
+    print(f"   ✓ {name}" if ok else f"   {mark} {name} ({hint})")
+PY
+if [ $? -ne 0 ]; then
+    echo "   ✗ Dependency check failed (see error above)"
+fi
 
 # Check Docker
 echo ""
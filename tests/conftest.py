@@ -0,0 +1,16 @@
+"""Shared pytest fixtures for NyayaAI tests."""
+import pytest
+
+
+@pytest.fixture(scope="session")
+def intake_agent():
+    """One IntakeAgent shared by every test in the session."""
+    from agents.intake_agent import IntakeAgent
+    return IntakeAgent()
+
+
+@pytest.fixture(scope="session")
+def embedding_model():
+    """The SentenceTransformer model, loaded once per test session."""
+    from utils.embeddings import get_embedding_model
+    return get_embedding_model()
@@ -1,7 +1,12 @@
 """Embedding utilities using SentenceTransformers."""
+import torch
 from sentence_transformers import SentenceTransformer
 from typing import List, Union
 import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
 
 from config.settings import settings
 
@@ -9,34 +14,104 @@ logger = logging.getLogger(__name__)
 
 # Global embedding model (loaded once)
 _embedding_model = None
+_embedding_model_lock = threading.Lock()
+
+
+def _reduce_precision(model: SentenceTransformer) -> SentenceTransformer:
+    """Run the encoder in FP16 on GPU, or int8 on CPU when enabled.
+    
+    Cosine similarities stay within ~1e-3 of FP32 for FP16; int8 dynamic
+    quantization of the Linear layers drifts a little more, so it is opt-in.
+    """
+    if torch.cuda.is_available():
+        logger.info("Using FP16 embedding weights on CUDA")
+        return model.half()
+    if settings.embedding_int8:
+        logger.info("Using int8 dynamically quantized embedding weights on CPU")
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+    return model
 
 
 def get_embedding_model() -> SentenceTransformer:
-    """Get or load the embedding model (singleton)."""
+    """Get or load the embedding model (singleton).
+    
+    Safe to call from several threads at once (e.g. the startup warmup and
+    a first request); the model is only loaded once.
+    """
     global _embedding_model
     if _embedding_model is None:
-        logger.info(f"Loading embedding model: {settings.embedding_model}")
-        _embedding_model = SentenceTransformer(settings.embedding_model)
-        logger.info("Embedding model loaded successfully")
+        with _embedding_model_lock:
+            if _embedding_model is None:
+                logger.info(f"Loading embedding model: {settings.embedding_model}")
+                _embedding_model = _reduce_precision(SentenceTransformer(settings.embedding_model))
+                logger.info("Embedding model loaded successfully")
     return _embedding_model
 
 
-def get_embeddings(texts: Union[str, List[str]]) -> List[List[float]]:
-    """Generate embeddings for text(s).
+# Texts per forward pass when encoding a list
+EMBED_BATCH_SIZE = 64
+
+# In-process LRU of recent texts -> vectors (repeated queries skip the encoder)
+EMBED_CACHE_SIZE = 4096
+_embedding_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+_embedding_cache_lock = threading.Lock()
+
+
+def _encode(texts: List[str], batch_size: int) -> np.ndarray:
+    """Run the encoder over `texts` (no caching)."""
+    embeddings = get_embedding_model().encode(
+        texts,
+        batch_size=batch_size,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=False
+    )
+    # An FP16 model yields float16 rows; hand out float32 regardless
+    return embeddings.astype(np.float32, copy=False)
+
+
+def get_embeddings(texts: Union[str, List[str]], batch_size: int = EMBED_BATCH_SIZE) -> np.ndarray:
+    """Generate embeddings for text(s) as a float32 array.
+    
+    Vectors are L2-normalized by the encoder (collections use cosine
+    distance, so rankings are unchanged). Recently seen texts are served
+    from an in-memory LRU; only the distinct misses are encoded, in one batch.
     
     Args:
         texts: Single string or list of strings
+        batch_size: Texts per forward pass
         
     Returns:
-        List of embedding vectors (list of floats)
+        Array of shape (len(texts), dim)
     """
-    model = get_embedding_model()
-    
     if isinstance(texts, str):
         texts = [texts]
+    if not texts:
+        return np.empty((0, get_embedding_model().get_sentence_embedding_dimension()), dtype=np.float32)
+    
+    found = {}
+    with _embedding_cache_lock:
+        for text in texts:
+            vector = _embedding_cache.get(text)
+            if vector is not None:
+                _embedding_cache.move_to_end(text)
+                found[text] = vector
+    
+    misses = [text for text in dict.fromkeys(texts) if text not in found]
+    if misses:
+        encoded = _encode(misses, batch_size)
+        with _embedding_cache_lock:
+            for text, row in zip(misses, encoded):
+                # Copy so a cached row doesn't keep the whole batch array alive
+                vector = row.copy()
+                vector.setflags(write=False)
+                _embedding_cache[text] = vector
+                found[text] = vector
+            while len(_embedding_cache) > EMBED_CACHE_SIZE:
+                _embedding_cache.popitem(last=False)
     
-    embeddings = model.encode(texts, convert_to_numpy=True, show_progress_bar=False)
-    return embeddings.tolist()
+    # np.stack copies, so callers never share (or mutate) cached rows
+    return np.stack([found[text] for text in texts])
 
 
 def get_embedding(text: str) -> List[float]:
@@ -48,5 +123,4 @@ def get_embedding(text: str) -> List[float]:
     Returns:
         Embedding vector (list of floats)
     """
-    embeddings = get_embeddings(text)
-    return embeddings[0]
+    return get_embeddings(text)[0].tolist()
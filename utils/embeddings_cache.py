@@ -0,0 +1,89 @@
+"""Persistent content-hash cache in front of get_embeddings() for ingestion."""
+import hashlib
+import logging
+import sqlite3
+import threading
+from typing import List, Optional, Union
+
+import numpy as np
+
+from config.settings import settings
+from utils.embeddings import get_embeddings
+
+logger = logging.getLogger(__name__)
+
+# SQLite caps bound parameters per statement; look keys up in slices.
+_LOOKUP_BATCH = 500
+
+_conn: Optional[sqlite3.Connection] = None
+_lock = threading.Lock()
+
+
+def _get_conn() -> sqlite3.Connection:
+    """Open (once) the cache database; callers must hold _lock."""
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(settings.embedding_cache_path, check_same_thread=False)
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+    return _conn
+
+
+def _cache_key(text: str) -> str:
+    """SHA-256 of the text, scoped to the embedding model so a model change misses."""
+    return hashlib.sha256(f"{settings.embedding_model}\0{text}".encode("utf-8")).hexdigest()
+
+
+def cached_get_embeddings(texts: Union[str, List[str]]) -> np.ndarray:
+    """Cached get_embeddings() for ingestion paths.
+
+    Each text is looked up by content hash; only the distinct misses are
+    embedded (in one batch) and written back. Results are returned in input
+    order.
+
+    Args:
+        texts: Single string or list of strings
+
+    Returns:
+        float32 array of shape (len(texts), dim); PointStruct accepts its rows
+    """
+    if isinstance(texts, str):
+        texts = [texts]
+    if not texts:
+        return get_embeddings([])  # shape (0, dim)
+
+    keys = [_cache_key(text) for text in texts]
+    found = {}
+    with _lock:
+        conn = _get_conn()
+        unique_keys = list(dict.fromkeys(keys))
+        for i in range(0, len(unique_keys), _LOOKUP_BATCH):
+            batch = unique_keys[i:i + _LOOKUP_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+            ).fetchall()
+            for key, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=np.float32)
+
+    # Identical texts (boilerplate headers, repeated resources) are embedded
+    # once and fanned back out to every position by key.
+    misses = {}
+    for i, key in enumerate(keys):
+        if key not in found:
+            misses.setdefault(key, i)
+    logger.debug(f"Embedding cache: {len(found)} distinct hits, {len(misses)} distinct misses")
+
+    if misses:
+        new_embeddings = get_embeddings([texts[i] for i in misses.values()])
+        with _lock:
+            conn = _get_conn()
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, embedding.tobytes()) for key, embedding in zip(misses, new_embeddings)]
+            )
+            conn.commit()
+        found.update(zip(misses, new_embeddings))
+
+    return np.stack([found[key] for key in keys])
@@ -0,0 +1,79 @@
+"""Persistent record of ingested connector sources, so re-runs skip unchanged URLs.
+
+Each record keeps one point ID written for the source, so callers can check
+that the points still exist (the collection may have been dropped or
+recreated since) before skipping it.
+"""
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Optional, Union
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_conn: Optional[sqlite3.Connection] = None
+_lock = threading.Lock()
+
+
+def _get_conn() -> sqlite3.Connection:
+    """Open (once) the state database; callers must hold _lock."""
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(settings.ingest_state_path, check_same_thread=False)
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS ingested_sources ("
+            "url TEXT NOT NULL, collection TEXT NOT NULL, version TEXT NOT NULL, "
+            "ingested_at INTEGER NOT NULL, sample_id TEXT, PRIMARY KEY (url, collection))"
+        )
+        columns = {row[1] for row in _conn.execute("PRAGMA table_info(ingested_sources)")}
+        if "sample_id" not in columns:
+            # Databases from before sample IDs; their rows are re-ingested once
+            _conn.execute("ALTER TABLE ingested_sources ADD COLUMN sample_id TEXT")
+            _conn.commit()
+    return _conn
+
+
+def ingested_sample_id(
+    url: str,
+    collection_name: str,
+    version: Optional[str] = None
+) -> Optional[Union[int, str]]:
+    """Look up the sample point ID recorded for `url` in the collection.
+
+    Args:
+        url: Source URL
+        collection_name: Target Qdrant collection
+        version: If given, the stored version must match it
+
+    Returns:
+        The point ID (int or UUID string, as stored in Qdrant), or None if
+        there is no matching record
+    """
+    with _lock:
+        row = _get_conn().execute(
+            "SELECT version, sample_id FROM ingested_sources WHERE url = ? AND collection = ?",
+            (url, collection_name)
+        ).fetchone()
+    if row is None or row[1] is None or (version is not None and row[0] != version):
+        return None
+    sample_id = row[1]
+    return int(sample_id) if sample_id.isdigit() else sample_id
+
+
+def mark_ingested(url: str, collection_name: str, version: str, sample_id: Any) -> None:
+    """Record that `url` was ingested into the collection at this version.
+
+    `sample_id` is the ID of one point written for the source.
+    """
+    with _lock:
+        conn = _get_conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO ingested_sources (url, collection, version, ingested_at, sample_id) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (url, collection_name, version, int(time.time()),
+             None if sample_id is None else str(sample_id))
+        )
+        conn.commit()
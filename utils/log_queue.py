@@ -0,0 +1,33 @@
+"""Non-blocking logging setup for the ingestion scripts."""
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_queue_logging(level: int = logging.INFO) -> None:
+    """Drop-in replacement for logging.basicConfig(level=...) for ingestion.
+
+    Records are put on an in-memory queue by the logging call and written to
+    stderr by a background QueueListener thread, so ingest loops never block
+    on stream I/O. Like basicConfig, this does nothing if the root logger
+    already has handlers.
+    """
+    global _listener
+    root = logging.getLogger()
+    if root.handlers:
+        return
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    _listener = QueueListener(log_queue, stream_handler)
+    _listener.start()
+    # Flush whatever is still queued when the script exits
+    atexit.register(_listener.stop)
+
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level)
@@ -0,0 +1,54 @@
+"""Compact storage of chunk text in Qdrant payloads.
+
+Chunk text is zstd-compressed and base64-encoded (payloads are JSON) under
+`chunk_text_zstd`. Without the optional `zstandard` package the text is
+stored as plain `chunk_text`; readers accept either form.
+"""
+import base64
+import logging
+import threading
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard as zstd
+except ImportError:  # pragma: no cover
+    zstd = None
+
+ZSTD_LEVEL = 3
+
+# zstd (de)compression contexts are not thread-safe; connectors ingest from
+# several threads, so keep one pair per thread.
+_local = threading.local()
+
+
+def _compressor():
+    if not hasattr(_local, "cctx"):
+        _local.cctx = zstd.ZstdCompressor(level=ZSTD_LEVEL)
+    return _local.cctx
+
+
+def _decompressor():
+    if not hasattr(_local, "dctx"):
+        _local.dctx = zstd.ZstdDecompressor()
+    return _local.dctx
+
+
+def encode_chunk_text(text: str) -> Dict[str, str]:
+    """Payload fields holding `text`, compressed when zstandard is available."""
+    if zstd is None:
+        return {"chunk_text": text}
+    compressed = _compressor().compress(text.encode("utf-8"))
+    return {"chunk_text_zstd": base64.b64encode(compressed).decode("ascii")}
+
+
+def decode_chunk_text(payload: Dict[str, Any]) -> str:
+    """Read chunk text back from a payload written by encode_chunk_text() (or plain `chunk_text`)."""
+    encoded = payload.get("chunk_text_zstd")
+    if encoded is None:
+        return payload.get("chunk_text", "")
+    if zstd is None:
+        logger.warning("Payload holds zstd-compressed text but zstandard is not installed")
+        return ""
+    return _decompressor().decompress(base64.b64decode(encoded)).decode("utf-8")
@@ -1,10 +1,26 @@
 """Tavily Search API integration for real-time web search."""
+import inspect
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache, partial
+from typing import List, Dict, Any, Optional, Tuple
 from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Recent searches are reused for a few minutes (retries, repeated questions)
+SEARCH_CACHE_SIZE = 512
+SEARCH_CACHE_TTL_SECONDS = 300
+
+# Searches that just failed (auth error, rate limit, timeout) are not retried for a short while
+FAILED_SEARCH_CACHE_SIZE = 128
+FAILED_SEARCH_TTL_SECONDS = 30
+
+# Keep-alive connections to api.tavily.com (agents and the pipeline search concurrently)
+HTTP_POOL_SIZE = 16
+
 TAVILY_AVAILABLE = False
 TavilyClient = None
 
@@ -17,6 +33,30 @@ except ImportError:
     TAVILY_AVAILABLE = False
 
 
+def _format_result(result: Any, include_raw_content: bool) -> Dict[str, Any]:
+    """Normalize one Tavily result item (dict or object) to our result dict."""
+    get = result.get if isinstance(result, dict) else partial(getattr, result)
+    return {
+        "title": get('title', ''),
+        "url": get('url', ''),
+        "content": get('content', ''),
+        "score": get('score', 0.0),
+        "published_date": get('published_date', None),
+        "raw_content": get('raw_content', '') if include_raw_content else None
+    }
+
+
+@lru_cache(maxsize=None)
+def _http_session():
+    """The keep-alive `requests.Session` shared by every TavilyClient."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_SIZE))
+    return session
+
+
 class TavilySearch:
     """Tavily search utility for real-time legal information retrieval."""
     
@@ -34,11 +74,70 @@ class TavilySearch:
             self.client = None
         else:
             try:
-                self.client = TavilyClient(api_key=self.api_key)
+                self.client = TavilyClient(api_key=self.api_key, **self._client_kwargs())
                 logger.info("Tavily client initialized successfully")
             except Exception as e:
                 logger.error(f"Failed to initialize Tavily client: {e}")
                 self.client = None
+        
+        # search params -> (expiry on the monotonic clock, formatted results)
+        self._cache: "OrderedDict[Tuple, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        # search params -> monotonic time until which a failed search is not retried
+        self._failed: "OrderedDict[Tuple, float]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+    
+    @staticmethod
+    def _client_kwargs() -> Dict[str, Any]:
+        """Extra TavilyClient arguments: a pooled keep-alive session, if supported.
+        
+        tavily-python talks to the API through `requests` (no HTTP/2). Its
+        TavilyClient takes a `session: requests.Session` argument (present in
+        0.8.5), which lets concurrent searches reuse a pool of warm TLS
+        connections. Older releases without it get no extra arguments.
+        """
+        if "session" not in inspect.signature(TavilyClient).parameters:
+            return {}
+        return {"session": _http_session()}
+    
+    def _cached(self, key: Tuple) -> Optional[List[Dict[str, Any]]]:
+        """Unexpired cached results for `key` (as fresh copies), else None."""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            expires_at, results = entry
+            if expires_at <= time.monotonic():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+        return [dict(result) for result in results]
+    
+    def _store(self, key: Tuple, results: List[Dict[str, Any]]) -> None:
+        """Cache `results` for SEARCH_CACHE_TTL_SECONDS, evicting the least recent entries."""
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic() + SEARCH_CACHE_TTL_SECONDS, [dict(result) for result in results])
+            self._cache.move_to_end(key)
+            while len(self._cache) > SEARCH_CACHE_SIZE:
+                self._cache.popitem(last=False)
+    
+    def _recently_failed(self, key: Tuple) -> bool:
+        """Whether the search for `key` failed within FAILED_SEARCH_TTL_SECONDS."""
+        with self._cache_lock:
+            retry_at = self._failed.get(key)
+            if retry_at is None:
+                return False
+            if retry_at <= time.monotonic():
+                del self._failed[key]
+                return False
+        return True
+    
+    def _record_failure(self, key: Tuple) -> None:
+        """Remember that the search for `key` just failed."""
+        with self._cache_lock:
+            self._failed[key] = time.monotonic() + FAILED_SEARCH_TTL_SECONDS
+            self._failed.move_to_end(key)
+            while len(self._failed) > FAILED_SEARCH_CACHE_SIZE:
+                self._failed.popitem(last=False)
     
     def search(
         self,
@@ -68,34 +167,36 @@ class TavilySearch:
             logger.warning("Tavily client not available")
             return []
         
+        cache_key = (
+            query, max_results, search_depth,
+            tuple(include_domains or ()), tuple(exclude_domains or ()),
+            include_answer, include_raw_content
+        )
+        cached = self._cached(cache_key)
+        if cached is not None:
+            logger.debug(f"Tavily cache hit for query: {query[:50]}...")
+            return cached
+        if self._recently_failed(cache_key):
+            logger.debug(f"Tavily search failed recently, skipping query: {query[:50]}...")
+            return []
+        
         try:
-            # Build search parameters
-            search_params = {
-                "query": query,
-                "max_results": max_results,
-                "search_depth": search_depth,
-                "include_answer": include_answer,
-                "include_raw_content": include_raw_content
-            }
-            
-            if include_domains:
-                search_params["include_domains"] = include_domains
-            
-            if exclude_domains:
-                search_params["exclude_domains"] = exclude_domains
-            
-            # Perform search
-            response = self.client.search(**search_params)
+            # Perform search (the SDK treats None domains as "no filter")
+            response = self.client.search(
+                query=query,
+                max_results=max_results,
+                search_depth=search_depth,
+                include_answer=include_answer,
+                include_raw_content=include_raw_content,
+                include_domains=include_domains or None,
+                exclude_domains=exclude_domains or None
+            )
             
             # Debug: Log response type and content
             logger.debug(f"Tavily response type: {type(response)}")
             logger.debug(f"Tavily response keys: {response.keys() if isinstance(response, dict) else dir(response)}")
             
-            # Format results - handle both dict and object responses
-            results = []
-            
-            # Get results list (handle dict or object)
-            raw_results = []
+            # Get results list and answer (handle dict or object responses)
             if isinstance(response, dict):
                 raw_results = response.get("results", [])
                 answer = response.get("answer")
@@ -103,30 +204,10 @@ class TavilySearch:
                 raw_results = getattr(response, 'results', [])
                 answer = getattr(response, 'answer', None)
             
-            for result in raw_results:
-                # Handle dict or object result items
-                if isinstance(result, dict):
-                    results.append({
-                        "title": result.get('title', ''),
-                        "url": result.get('url', ''),
-                        "content": result.get('content', ''),
-                        "score": result.get('score', 0.0),
-                        "published_date": result.get('published_date'),
-                        "raw_content": result.get('raw_content', '') if include_raw_content else None
-                    })
-                else:
-                    results.append({
-                        "title": getattr(result, 'title', ''),
-                        "url": getattr(result, 'url', ''),
-                        "content": getattr(result, 'content', ''),
-                        "score": getattr(result, 'score', 0.0),
-                        "published_date": getattr(result, 'published_date', None),
-                        "raw_content": getattr(result, 'raw_content', '') if include_raw_content else None
-                    })
-            
-            # Include AI-generated answer if available
+            # AI-generated answer (if available) goes first, then the results
+            results = []
             if include_answer and answer:
-                results.insert(0, {
+                results.append({
                     "title": "AI-Generated Answer",
                     "url": None,
                     "content": answer,
@@ -135,12 +216,16 @@ class TavilySearch:
                     "raw_content": None,
                     "is_answer": True
                 })
+            results.extend(_format_result(result, include_raw_content) for result in raw_results)
             
             logger.info(f"Tavily search returned {len(results)} results for query: {query[:50]}...")
+            self._store(cache_key, results)
             return results
             
         except Exception as e:
-            logger.error(f"Error performing Tavily search: {e}", exc_info=True)
+            logger.error(f"Error performing Tavily search: {e}")
+            logger.debug("Error performing Tavily search (traceback)", exc_info=True)
+            self._record_failure(cache_key)
             return []
     
     def search_legal_info(